@@ -5,7 +5,7 @@ import sys
 from app.logging_config import setup_logging, get_logger
 from app.services import GoogleSheetsService, OzonBlockedError
 from app.services.parser import OzonParser
-from app.services.position_tracker import PositionTracker
+from app.services.position_tracker import PositionTracker, SearchThrottle
 from app.services.telegram import get_telegram_notifier
 from app.settings import settings
 
@@ -16,22 +16,42 @@ telegram = get_telegram_notifier()
 async def process_spreadsheet(
     spreadsheet_id: str,
     parser: OzonParser,
+    sheets_semaphore: asyncio.Semaphore,
+    throttle: SearchThrottle,
     max_position: int = 1000,
 ) -> None:
     """Process a single spreadsheet in its own browser tab."""
     sheets = GoogleSheetsService(spreadsheet_id)
-    sheets.connect()
+    # Auth + open_by_key block; other spreadsheets are already searching
+    await asyncio.to_thread(sheets.connect)
 
     short_id = spreadsheet_id[:8]
     try:
-        tracker = PositionTracker(sheets, parser)
+        tracker = PositionTracker(sheets, parser, sheets_semaphore, throttle)
         await tracker.run(max_position=max_position)
     except OzonBlockedError as e:
         logger.error(f"[{short_id}] Blocked: {e}")
-        await telegram.send_message(f"<b>[{short_id}] Блокировка</b>\n{e}")
+        await telegram.send_error(("blocked", str(e)), f"<b>[{short_id}] Блокировка</b>\n{e}")
     except Exception as e:
         logger.exception(f"[{short_id}] Error: {e}")
-        await telegram.send_message(f"<b>[{short_id}] Ошибка</b>\n{e}")
+        await telegram.send_error((type(e).__name__, str(e)), f"<b>[{short_id}] Ошибка</b>\n{e}")
+
+
+async def track_spreadsheets(spreadsheet_ids: list[str], parser: OzonParser) -> None:
+    """Process all spreadsheets in parallel (each in its own tab)."""
+    # One limit on Sheets writes across all trackers, created on the running loop
+    sheets_semaphore = asyncio.BoundedSemaphore(PositionTracker.SHEETS_CONCURRENCY)
+    # Search concurrency and block backoff apply to the browser, not per spreadsheet
+    throttle = SearchThrottle.for_parser(parser)
+    tasks = []
+    for i, spreadsheet_id in enumerate(spreadsheet_ids):
+        # Stagger start times slightly
+        if i > 0:
+            await asyncio.sleep(random.uniform(1, 2))
+        task = asyncio.create_task(process_spreadsheet(spreadsheet_id, parser, sheets_semaphore, throttle))
+        tasks.append(task)
+
+    await asyncio.gather(*tasks, return_exceptions=True)
 
 
 async def run_tracker() -> None:
@@ -46,25 +66,24 @@ async def run_tracker() -> None:
 
     try:
         async with OzonParser() as parser:
-            # Process all spreadsheets in parallel (each in its own tab)
-            tasks = []
-            for i, spreadsheet_id in enumerate(spreadsheet_ids):
-                # Stagger start times slightly
-                if i > 0:
-                    await asyncio.sleep(random.uniform(1, 2))
-                task = asyncio.create_task(process_spreadsheet(spreadsheet_id, parser))
-                tasks.append(task)
-
-            await asyncio.gather(*tasks, return_exceptions=True)
-
-        logger.info("Done")
-        await telegram.send_message("Трекинг завершён")
+            while True:
+                await track_spreadsheets(spreadsheet_ids, parser)
+                logger.info("Done")
+                await telegram.send_message("Трекинг завершён")
+
+                if settings.tracker_interval_minutes <= 0:
+                    break
+                # Keep the warm browser instead of a cold start on the next pass
+                logger.info(f"Next pass in {settings.tracker_interval_minutes} min")
+                await asyncio.sleep(settings.tracker_interval_minutes * 60)
     except OzonBlockedError as e:
         logger.error(f"Парсер остановлен: {e}")
         await telegram.send_message(f"<b>Парсер остановлен</b>\n{e}")
     except Exception as e:
         logger.exception(f"Unexpected error: {e}")
         await telegram.send_message(f"<b>Критическая ошибка</b>\n{e}")
+    finally:
+        await telegram.aclose()
 
 
 if __name__ == "__main__":
@@ -1,20 +1,127 @@
 import asyncio
 import random
+import re
 import shutil
+import time
 from pathlib import Path
+from urllib.parse import urlencode
 
 from playwright.async_api import (
     async_playwright,
     Page,
     Playwright,
     BrowserContext,
+    TimeoutError as PlaywrightTimeout,
 )
 from playwright_stealth import Stealth
 from app.logging_config import get_logger
+from app.services.serp_cache import SerpEntry
 from app.settings import settings
 
 logger = get_logger(__name__)
 
+# Page titles of captcha/antibot challenge pages
+CAPTCHA_TITLE_RE = re.compile(r"бот|robot|bot|captcha|подтверд|confirm|antibot|challenge", re.IGNORECASE)
+
+# Long SERPs: drop already-collected tiles every few scrolls so the DOM (and
+# every querySelectorAll over it) stays bounded
+TRIM_AFTER_POSITION = 200
+TRIM_EVERY_SCROLLS = 10
+TRIM_KEEP_TILES = 50
+
+# Only nodes whose every product link was already collected are removed, so the
+# tile selector matching more than result tiles can't drop unseen products
+TRIM_RESULTS_JS = """
+    ([keep, collected]) => {
+        const seen = new Set(collected);
+        const productRe = /\\/product\\/[^?#]*-(\\d+)\\/?(?:[?#]|$)/;
+        const tiles = document.querySelectorAll('[data-widget="searchResultsV2"] > div > div');
+        const cut = tiles.length - keep;
+        if (cut <= 0) return 0;
+        const anchor = tiles[cut];
+        const before = anchor.getBoundingClientRect().top;
+        let removed = 0;
+        for (let i = 0; i < cut; i++) {
+            const links = tiles[i].querySelectorAll('a[href*="/product/"]');
+            if (!links.length) continue;
+            let collectedAll = true;
+            for (const link of links) {
+                const match = productRe.exec(link.href);
+                if (match && !seen.has(match[1])) {
+                    collectedAll = false;
+                    break;
+                }
+            }
+            if (!collectedAll) continue;
+            tiles[i].remove();
+            removed++;
+        }
+        window.scrollBy(0, anchor.getBoundingClientRect().top - before);
+        return removed;
+    }
+"""
+
+
+def build_search_url(query: str) -> str:
+    """Search URL for a query, encoded so spaces, "&" or "#" reach Ozon intact."""
+    return f"{settings.base_url}/search/?{urlencode({'text': query})}"
+
+
+def next_reading_pause(scroll_count: int) -> int:
+    """Scroll number of the next reading pause: every 7-13 scrolls (~1 in 10, as before)."""
+    return scroll_count + random.randint(7, 13)
+
+
+class SerpScan:
+    """
+    Position bookkeeping for one search scan.
+
+    Articles sharing the query are looked for in the same scan, so the SERP
+    handed back through serp answers them too. serp.complete is only set when
+    max_position was reached - a scan that stalls on empty scrolls may have
+    stopped short of the real end of results.
+    """
+
+    def __init__(
+        self,
+        target_article: str,
+        other_articles: frozenset[str],
+        max_position: int,
+        serp: SerpEntry | None,
+    ) -> None:
+        self.target_article = target_article
+        self.remaining = {target_article, *other_articles}
+        self.max_position = max_position
+        self.serp = serp
+        self.found: int | None = None
+        self.position = 0
+
+    def add(self, new_products: list[str]) -> bool:
+        """Count newly collected products in SERP order. Returns True once the scan can stop."""
+        if self.serp is not None:
+            self.serp.ids.extend(new_products)
+        for product_id in new_products:
+            self.position += 1
+            if product_id in self.remaining:
+                self.remaining.discard(product_id)
+                if product_id == self.target_article:
+                    logger.info(f"Found {self.target_article} at position {self.position}")
+                    self.found = self.position
+                if not self.remaining:
+                    return True
+            if self.position >= self.max_position:
+                self.mark_complete()
+                return True
+        return False
+
+    def mark_complete(self) -> None:
+        if self.serp is not None:
+            self.serp.complete = True
+
+    def result_on_block(self) -> int:
+        """Position already found, else -1 so the caller retries the blocked search."""
+        return self.found if self.found is not None else -1
+
 
 class OzonBlockedError(Exception):
     """Raised when Ozon blocks access and refresh doesn't help."""
@@ -31,6 +138,9 @@ class OzonParser:
         self._playwright: Playwright | None = None
         self._context: BrowserContext | None = None
         self._restart_lock: asyncio.Lock | None = None
+        self.restart_generation = 0  # Bumped by every restart_browser()
+        self.idle_pages: list = []  # Warm tabs handed back by finished trackers
+        self._captcha_wait: asyncio.Task | None = None
 
     def _get_lock(self) -> asyncio.Lock:
         """Get or create restart lock."""
@@ -133,14 +243,19 @@ class OzonParser:
         if self._playwright:
             await self._playwright.stop()
 
-    async def restart_browser(self) -> None:
+    async def restart_browser(self, generation: int | None = None) -> None:
         """Close browser, wipe browser_data, and relaunch with clean profile.
 
-        Thread-safe: uses lock to prevent concurrent restarts.
+        Thread-safe: uses lock to prevent concurrent restarts. Pass the
+        restart_generation seen before the failure to skip the relaunch if
+        another tab already did it meanwhile.
         """
         lock = self._get_lock()
 
         async with lock:
+            if generation is not None and generation != self.restart_generation:
+                logger.debug("Browser already restarted by another tab")
+                return
             logger.info("Restarting browser with clean profile...")
             if self._context:
                 try:
@@ -163,6 +278,8 @@ class OzonParser:
             self._context = await self._playwright.chromium.launch_persistent_context(
                 **self._build_launch_options()
             )
+            self.restart_generation += 1
+            self.idle_pages.clear()
             logger.info("Browser restarted with clean profile")
 
     async def _new_page(self, block_resources: bool = True) -> Page:
@@ -427,8 +544,7 @@ class OzonParser:
     async def _is_captcha_page(self, page: Page) -> bool:
         try:
             title = await page.title()
-            captcha_keywords = ["бот", "robot", "bot", "captcha", "подтверд", "confirm", "antibot", "challenge"]
-            return any(kw in title.lower() for kw in captcha_keywords)
+            return bool(CAPTCHA_TITLE_RE.search(title))
         except Exception:
             return False
 
@@ -449,9 +565,7 @@ class OzonParser:
         try:
             result = await page.evaluate("""
                 () => {
-                    const title = document.title.toLowerCase();
-                    const captchaKeywords = ['бот', 'robot', 'bot', 'captcha', 'подтверд', 'confirm', 'antibot', 'challenge'];
-                    const isCaptcha = captchaKeywords.some(kw => title.includes(kw));
+                    const isCaptcha = /бот|robot|bot|captcha|подтверд|confirm|antibot|challenge/i.test(document.title);
 
                     const h1 = document.querySelector('h1');
                     const isBlocked = h1 && h1.innerText.toLowerCase().includes('доступ ограничен');
@@ -464,7 +578,29 @@ class OzonParser:
             return False, False
 
     async def _wait_for_captcha(self, page: Page) -> None:
-        """Wait for manual captcha/challenge solving."""
+        """
+        Wait for manual captcha solving.
+
+        Worker tabs share one browser context, so a captcha hit by several of
+        them is solved once: the first tab owns the wait, the others wait on
+        the same task and then reload.
+        """
+        pending = self._captcha_wait
+        if pending is not None and not pending.done():
+            logger.info("Captcha already pending in another tab, waiting for it...")
+            await asyncio.wait([pending])
+            try:
+                await page.reload(wait_until="domcontentloaded")
+            except Exception:
+                pass
+            if not await self._is_captcha_page(page):
+                return
+
+        self._captcha_wait = asyncio.create_task(self._wait_captcha_solved(page))
+        await self._captcha_wait
+
+    async def _wait_captcha_solved(self, page: Page) -> None:
+        """Poll the page until the captcha/challenge is solved manually."""
         logger.warning("Captcha/challenge detected!")
         logger.warning("Please solve captcha manually in the browser window...")
         logger.info("You have 60 seconds to solve the captcha")
@@ -516,52 +652,58 @@ class OzonParser:
         product_id = parts[-1]
         return product_id if product_id.isdigit() else None
 
+    async def _trim_results(self, page: Page, seen_products: set[str]) -> None:
+        """Remove result tiles that were already collected, keeping the newest ones."""
+        try:
+            removed = await page.evaluate(TRIM_RESULTS_JS, [TRIM_KEEP_TILES, list(seen_products)])
+            if removed:
+                logger.debug(f"Trimmed {removed} result tiles")
+        except Exception as e:
+            logger.debug(f"Result trim failed: {e}")
+
     async def _collect_products_from_page(
         self, page: Page, seen_products: set[str]
     ) -> list[str]:
         """Collect new product IDs from current page state using optimized JS extraction."""
         # Pass seen products to JS to filter there (reduces data transfer)
-        seen_list = list(seen_products) if len(seen_products) < 2000 else []
+        seen_list = list(seen_products)
 
         all_ids = await page.evaluate("""
             (seen) => {
                 const seenSet = new Set(seen);
                 const ids = [];
-                // Use faster iteration with early termination hints
-                const links = document.getElementsByTagName('a');
+                // DOM pre-filters product links; one regex replaces the substring chain
+                const productRe = /\\/product\\/[^?#]*-(\\d+)\\/?(?:[?#]|$)/;
+                const links = document.querySelectorAll('a[href*="/product/"]');
                 for (let i = 0; i < links.length; i++) {
                     const href = links[i].href;
-                    if (!href || !href.includes('/product/')) continue;
                     if (href.includes('/reviews') || href.includes('/questions')) continue;
-                    // Extract ID directly without full regex
-                    const productIdx = href.indexOf('/product/');
-                    if (productIdx === -1) continue;
-                    const afterProduct = href.substring(productIdx + 9);
-                    const queryIdx = afterProduct.indexOf('?');
-                    const path = queryIdx > -1 ? afterProduct.substring(0, queryIdx) : afterProduct;
-                    const lastDash = path.lastIndexOf('-');
-                    if (lastDash === -1) continue;
-                    const id = path.substring(lastDash + 1).replace(/\\/$/, '');
-                    if (!/^\\d+$/.test(id)) continue;
-                    if (!seenSet.has(id) && !ids.includes(id)) {
-                        ids.push(id);
-                    }
+                    const match = productRe.exec(href);
+                    if (!match) continue;
+                    const id = match[1];
+                    if (seenSet.has(id)) continue;
+                    seenSet.add(id);
+                    ids.push(id);
                 }
                 return ids;
             }
         """, seen_list)
 
         # Update seen set and return new products
-        for product_id in all_ids:
-            seen_products.add(product_id)
+        seen_products.update(all_ids)
         return all_ids
 
     async def find_product_position(
-        self, query: str, target_article: str, max_position: int = 1000, page: Page | None = None
+        self, query: str, target_article: str, max_position: int = 1000, page: Page | None = None,
+        serp: SerpEntry | None = None,
+        other_articles: frozenset[str] = frozenset(),
     ) -> int | None:
         """
         Search for a product position in Ozon search results using infinite scroll.
         Returns the position (1-based) or None if not found within max_position.
+        If serp is given, every collected product ID is appended to serp.ids in
+        order, and serp.complete tells whether the scan covered max_position.
+        The scan only stops early once other_articles have been seen as well.
         """
         logger.info(f"Search: {query} -> {target_article}")
 
@@ -570,11 +712,11 @@ class OzonParser:
             page = await self._new_page()
 
         seen_products: set[str] = set()
-        position = 0
+        scan = SerpScan(target_article, other_articles, max_position, serp)
         scroll_count = 0
 
         try:
-            search_url = f"{settings.base_url}/search/?text={query}"
+            search_url = build_search_url(query)
             try:
                 await page.goto(search_url, wait_until="domcontentloaded")
             except Exception as e:
@@ -604,14 +746,15 @@ class OzonParser:
                 logger.info(f"Small page ({body_length} chars), waiting for JS... Title: {page_info.get('title')}")
                 logger.debug(f"Page text: {page_info.get('bodyText', '')[:200]}")
 
-                # Wait up to 15 seconds for JS challenge to resolve
-                for i in range(30):
-                    await page.wait_for_timeout(500)
-                    body_length = await page.evaluate("document.body.innerHTML.length")
-                    if body_length > 10000:
-                        logger.info(f"JS challenge resolved after {(i+1)*0.5}s, body: {body_length} chars")
-                        break
-                else:
+                # Wait up to 15 seconds for JS challenge to resolve, polling
+                # in-page every 100 ms rather than a 500 ms round-trip loop
+                started = time.monotonic()
+                try:
+                    await page.wait_for_function(
+                        "document.body.innerHTML.length > 10000", polling=100, timeout=15000
+                    )
+                    logger.info(f"JS challenge resolved after {time.monotonic() - started:.1f}s")
+                except PlaywrightTimeout:
                     # Still small - dump current state
                     final_info = await page.evaluate("""
                         () => ({
@@ -658,18 +801,15 @@ class OzonParser:
 
             # Collect products from first page
             new_products = await self._collect_products_from_page(page, seen_products)
-
-            for product_id in new_products:
-                position += 1
-                if product_id == target_article:
-                    logger.info(f"Found {target_article} at position {position}")
-                    return position
+            if scan.add(new_products):
+                return scan.found
 
             # Infinite scroll loop
             empty_scrolls = 0
             max_empty_scrolls = 5
+            next_pause_at = next_reading_pause(scroll_count)
 
-            while position < max_position:
+            while scan.position < max_position:
                 scroll_count += 1
 
                 # Human-like scroll behavior
@@ -690,9 +830,10 @@ class OzonParser:
                     await page.mouse.wheel(0, random.randint(100, 300))
                     await page.wait_for_timeout(random.randint(200, 400))
 
-                # 4. Random pause sometimes (like reading)
-                if random.random() < 0.1:
+                # 4. Pause now and then (like reading)
+                if scroll_count >= next_pause_at:
                     await page.wait_for_timeout(random.randint(1000, 2000))
+                    next_pause_at = next_reading_pause(scroll_count)
 
                 # Check for captcha/block
                 is_captcha, is_blocked = await self._check_page_status(page)
@@ -701,7 +842,7 @@ class OzonParser:
                     continue
                 if is_blocked:
                     if not await self._handle_block_page(page):
-                        return -1
+                        return scan.result_on_block()
                     continue
 
                 new_products = await self._collect_products_from_page(page, seen_products)
@@ -709,22 +850,27 @@ class OzonParser:
                 if not new_products:
                     empty_scrolls += 1
                     if empty_scrolls >= max_empty_scrolls:
-                        return None
+                        return scan.found
                     continue
 
                 empty_scrolls = 0
-                logger.debug(f"Scroll {scroll_count}: +{len(new_products)} (total: {position + len(new_products)})")
-
-                for product_id in new_products:
-                    position += 1
-                    if product_id == target_article:
-                        logger.info(f"Found {target_article} at position {position}")
-                        return position
-                    if position >= max_position:
-                        return None
-
-            return None
-
+                logger.debug(f"Scroll {scroll_count}: +{len(new_products)} (total: {scan.position + len(new_products)})")
+                if scan.add(new_products):
+                    return scan.found
+
+                if scan.position > TRIM_AFTER_POSITION and scroll_count % TRIM_EVERY_SCROLLS == 0:
+                    await self._trim_results(page, seen_products)
+
+            # Loop only ends here once max_position products were scanned
+            scan.mark_complete()
+            return scan.found
+
+        except Exception as e:
+            if scan.found is None:
+                raise
+            # Target already located - a failure further down only costs the siblings
+            logger.warning(f"Scan for {query} aborted after finding {target_article}: {e}")
+            return scan.found
         finally:
             if not page_provided:
                 await page.close()
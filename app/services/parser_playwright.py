@@ -11,6 +11,7 @@ import asyncio
 import json
 import random
 import shutil
+import time
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
@@ -22,9 +23,23 @@ from playwright.async_api import (
     Playwright,
     BrowserContext,
     Browser,
+    TimeoutError as PlaywrightTimeout,
 )
 
 from app.logging_config import get_logger
+from app.services.parser import (
+    CAPTCHA_TITLE_RE,
+    TRIM_AFTER_POSITION,
+    TRIM_EVERY_SCROLLS,
+    TRIM_KEEP_TILES,
+    TRIM_RESULTS_JS,
+    OzonBlockedError,
+    OzonPageLoadError,
+    SerpScan,
+    build_search_url,
+    next_reading_pause,
+)
+from app.services.serp_cache import SerpEntry
 from app.settings import settings
 
 logger = get_logger(__name__)
@@ -99,16 +114,6 @@ def _load_cookies_from_json() -> List[Dict[str, Any]]:
         return []
 
 
-class OzonBlockedError(Exception):
-    """Raised when Ozon blocks access and refresh doesn't help."""
-    pass
-
-
-class OzonPageLoadError(Exception):
-    """Raised when page fails to load (timeout, network error)."""
-    pass
-
-
 class OzonParserPlaywright:
     """
     Ozon parser using Playwright with Chromium persistent context.
@@ -123,6 +128,9 @@ class OzonParserPlaywright:
         self._playwright: Playwright | None = None
         self._context: BrowserContext | None = None
         self._restart_lock: asyncio.Lock | None = None
+        self.restart_generation = 0  # Bumped by every restart_browser()
+        self.idle_pages: list = []  # Warm tabs handed back by finished trackers
+        self._captcha_wait: asyncio.Task | None = None
 
     def _get_lock(self) -> asyncio.Lock:
         if self._restart_lock is None:
@@ -223,11 +231,14 @@ class OzonParserPlaywright:
             except Exception:
                 pass
 
-    async def restart_browser(self) -> None:
-        """Close and relaunch browser."""
+    async def restart_browser(self, generation: int | None = None) -> None:
+        """Close and relaunch browser, unless another tab did since `generation`."""
         lock = self._get_lock()
 
         async with lock:
+            if generation is not None and generation != self.restart_generation:
+                logger.debug("Browser already restarted by another tab")
+                return
             logger.info("Restarting browser...")
 
             if self._context:
@@ -241,6 +252,8 @@ class OzonParserPlaywright:
                 self._playwright = await async_playwright().start()
 
             self._context = await self._create_context()
+            self.restart_generation += 1
+            self.idle_pages.clear()
             logger.info("Browser restarted")
 
     async def _new_page(self) -> Page:
@@ -290,8 +303,7 @@ class OzonParserPlaywright:
     async def _is_captcha_page(self, page: Page) -> bool:
         try:
             title = await page.title()
-            captcha_keywords = ["бот", "robot", "bot", "captcha", "подтверд", "confirm", "antibot", "challenge"]
-            return any(kw in title.lower() for kw in captcha_keywords)
+            return bool(CAPTCHA_TITLE_RE.search(title))
         except Exception:
             return False
 
@@ -310,9 +322,7 @@ class OzonParserPlaywright:
         try:
             result = await page.evaluate("""
                 () => {
-                    const title = document.title.toLowerCase();
-                    const captchaKeywords = ['бот', 'robot', 'bot', 'captcha', 'подтверд', 'confirm', 'antibot', 'challenge'];
-                    const isCaptcha = captchaKeywords.some(kw => title.includes(kw));
+                    const isCaptcha = /бот|robot|bot|captcha|подтверд|confirm|antibot|challenge/i.test(document.title);
                     const h1 = document.querySelector('h1');
                     const isBlocked = h1 && h1.innerText.toLowerCase().includes('доступ ограничен');
                     return { isCaptcha, isBlocked };
@@ -323,6 +333,22 @@ class OzonParserPlaywright:
             return False, False
 
     async def _wait_for_captcha(self, page: Page) -> None:
+        """Wait for manual captcha solving; tabs that hit it concurrently share one wait."""
+        pending = self._captcha_wait
+        if pending is not None and not pending.done():
+            logger.info("Captcha already pending in another tab, waiting for it...")
+            await asyncio.wait([pending])
+            try:
+                await page.reload(wait_until="domcontentloaded")
+            except Exception:
+                pass
+            if not await self._is_captcha_page(page):
+                return
+
+        self._captcha_wait = asyncio.create_task(self._wait_captcha_solved(page))
+        await self._captcha_wait
+
+    async def _wait_captcha_solved(self, page: Page) -> None:
         logger.warning("Captcha detected! Waiting 60s for manual solve...")
         for _ in range(60):
             if not await self._is_captcha_page(page):
@@ -355,41 +381,46 @@ class OzonParserPlaywright:
 
     # ============ Product collection from original parser.py ============
 
+    async def _trim_results(self, page: Page, seen_products: set[str]) -> None:
+        """Remove result tiles that were already collected, keeping the newest ones."""
+        try:
+            removed = await page.evaluate(TRIM_RESULTS_JS, [TRIM_KEEP_TILES, list(seen_products)])
+            if removed:
+                logger.debug(f"Trimmed {removed} result tiles")
+        except Exception as e:
+            logger.debug(f"Result trim failed: {e}")
+
     async def _collect_products_from_page(self, page: Page, seen_products: set[str]) -> list[str]:
-        seen_list = list(seen_products) if len(seen_products) < 2000 else []
+        seen_list = list(seen_products)
 
         all_ids = await page.evaluate("""
             (seen) => {
                 const seenSet = new Set(seen);
                 const ids = [];
-                const links = document.getElementsByTagName('a');
+                // DOM pre-filters product links; one regex replaces the substring chain
+                const productRe = /\\/product\\/[^?#]*-(\\d+)\\/?(?:[?#]|$)/;
+                const links = document.querySelectorAll('a[href*="/product/"]');
                 for (let i = 0; i < links.length; i++) {
                     const href = links[i].href;
-                    if (!href || !href.includes('/product/')) continue;
                     if (href.includes('/reviews') || href.includes('/questions')) continue;
-                    const productIdx = href.indexOf('/product/');
-                    if (productIdx === -1) continue;
-                    const afterProduct = href.substring(productIdx + 9);
-                    const queryIdx = afterProduct.indexOf('?');
-                    const path = queryIdx > -1 ? afterProduct.substring(0, queryIdx) : afterProduct;
-                    const lastDash = path.lastIndexOf('-');
-                    if (lastDash === -1) continue;
-                    const id = path.substring(lastDash + 1).replace(/\\/$/, '');
-                    if (!/^\\d+$/.test(id)) continue;
-                    if (!seenSet.has(id) && !ids.includes(id)) {
-                        ids.push(id);
-                    }
+                    const match = productRe.exec(href);
+                    if (!match) continue;
+                    const id = match[1];
+                    if (seenSet.has(id)) continue;
+                    seenSet.add(id);
+                    ids.push(id);
                 }
                 return ids;
             }
         """, seen_list)
 
-        for product_id in all_ids:
-            seen_products.add(product_id)
+        seen_products.update(all_ids)
         return all_ids
 
     async def find_product_position(
-        self, query: str, target_article: str, max_position: int = 1000, page: Page | None = None
+        self, query: str, target_article: str, max_position: int = 1000, page: Page | None = None,
+        serp: SerpEntry | None = None,
+        other_articles: frozenset[str] = frozenset(),
     ) -> int | None:
         """Search for a product position using infinite scroll."""
         logger.info(f"Search: {query} -> {target_article}")
@@ -399,11 +430,11 @@ class OzonParserPlaywright:
             page = await self._new_page()
 
         seen_products: set[str] = set()
-        position = 0
+        scan = SerpScan(target_article, other_articles, max_position, serp)
         scroll_count = 0
 
         try:
-            search_url = f"{settings.base_url}/search/?text={query}"
+            search_url = build_search_url(query)
             try:
                 await page.goto(search_url, wait_until="domcontentloaded")
             except Exception as e:
@@ -420,12 +451,15 @@ class OzonParserPlaywright:
             body_length = await page.evaluate("document.body.innerHTML.length")
             if body_length < 5000:
                 logger.info(f"Small page ({body_length} chars), waiting for JS...")
-                for i in range(30):
-                    await page.wait_for_timeout(500)
-                    body_length = await page.evaluate("document.body.innerHTML.length")
-                    if body_length > 10000:
-                        logger.info(f"JS resolved after {(i+1)*0.5}s")
-                        break
+                # Poll in-page every 100 ms rather than a 500 ms round-trip loop
+                started = time.monotonic()
+                try:
+                    await page.wait_for_function(
+                        "document.body.innerHTML.length > 10000", polling=100, timeout=15000
+                    )
+                    logger.info(f"JS resolved after {time.monotonic() - started:.1f}s")
+                except PlaywrightTimeout:
+                    pass
 
             # Human-like delay
             await page.wait_for_timeout(random.randint(300, 800))
@@ -448,18 +482,15 @@ class OzonParserPlaywright:
 
             # Collect initial products
             new_products = await self._collect_products_from_page(page, seen_products)
-
-            for product_id in new_products:
-                position += 1
-                if product_id == target_article:
-                    logger.info(f"Found {target_article} at position {position}")
-                    return position
+            if scan.add(new_products):
+                return scan.found
 
             # Infinite scroll
             empty_scrolls = 0
             max_empty_scrolls = 5
+            next_pause_at = next_reading_pause(scroll_count)
 
-            while position < max_position:
+            while scan.position < max_position:
                 scroll_count += 1
 
                 # Human-like scroll
@@ -474,8 +505,9 @@ class OzonParserPlaywright:
                     await page.mouse.wheel(0, random.randint(100, 300))
                     await page.wait_for_timeout(random.randint(200, 400))
 
-                if random.random() < 0.1:
+                if scroll_count >= next_pause_at:
                     await page.wait_for_timeout(random.randint(1000, 2000))
+                    next_pause_at = next_reading_pause(scroll_count)
 
                 # Check captcha/block
                 is_captcha, is_blocked = await self._check_page_status(page)
@@ -484,7 +516,7 @@ class OzonParserPlaywright:
                     continue
                 if is_blocked:
                     if not await self._handle_block_page(page):
-                        return -1
+                        return scan.result_on_block()
                     continue
 
                 new_products = await self._collect_products_from_page(page, seen_products)
@@ -492,22 +524,27 @@ class OzonParserPlaywright:
                 if not new_products:
                     empty_scrolls += 1
                     if empty_scrolls >= max_empty_scrolls:
-                        return None
+                        return scan.found
                     continue
 
                 empty_scrolls = 0
-                logger.debug(f"Scroll {scroll_count}: +{len(new_products)} (total: {position + len(new_products)})")
-
-                for product_id in new_products:
-                    position += 1
-                    if product_id == target_article:
-                        logger.info(f"Found {target_article} at position {position}")
-                        return position
-                    if position >= max_position:
-                        return None
-
-            return None
-
+                logger.debug(f"Scroll {scroll_count}: +{len(new_products)} (total: {scan.position + len(new_products)})")
+                if scan.add(new_products):
+                    return scan.found
+
+                if scan.position > TRIM_AFTER_POSITION and scroll_count % TRIM_EVERY_SCROLLS == 0:
+                    await self._trim_results(page, seen_products)
+
+            # Loop only ends here once max_position products were scanned
+            scan.mark_complete()
+            return scan.found
+
+        except Exception as e:
+            if scan.found is None:
+                raise
+            # Target already located - a failure further down only costs the siblings
+            logger.warning(f"Scan for {query} aborted after finding {target_article}: {e}")
+            return scan.found
         finally:
             if not page_provided:
                 await page.close()
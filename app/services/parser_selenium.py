@@ -9,18 +9,33 @@ Based on recaptcha_solver_selenium.py anti-detection techniques:
 - CPU/memory optimizations
 """
 import asyncio
+import functools
 import os
 import random
 import shutil
 import subprocess
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, NamedTuple, Optional
 
 from app.logging_config import get_logger
+from app.services.parser import (
+    CAPTCHA_TITLE_RE,
+    TRIM_AFTER_POSITION,
+    TRIM_EVERY_SCROLLS,
+    TRIM_KEEP_TILES,
+    TRIM_RESULTS_JS,
+    OzonBlockedError,
+    OzonPageLoadError,
+    SerpScan,
+    build_search_url,
+    next_reading_pause,
+)
+from app.services.serp_cache import SerpEntry
 from app.settings import settings
 
 logger = get_logger(__name__)
@@ -31,9 +46,6 @@ try:
     from selenium.webdriver.chrome.service import Service as ChromeService
     from selenium.webdriver.edge.options import Options as EdgeOptions
     from selenium.webdriver.edge.service import Service as EdgeService
-    from selenium.webdriver.common.by import By
-    from selenium.webdriver.support.ui import WebDriverWait
-    from selenium.webdriver.support import expected_conditions as EC
     from selenium.webdriver.common.action_chains import ActionChains
     SELENIUM_AVAILABLE = True
 except ImportError:
@@ -52,23 +64,108 @@ except ImportError:
     EdgeChromiumDriverManager = None
 
 
-class OzonBlockedError(Exception):
-    """Raised when Ozon blocks access and refresh doesn't help."""
-    pass
-
-
-class OzonPageLoadError(Exception):
-    """Raised when page fails to load (timeout, network error)."""
-    pass
-
-
 # Screen resolutions for fingerprint randomization
 SCREEN_RESOLUTIONS = [
     (1920, 1080), (2560, 1440), (1366, 768),
     (1536, 864), (1440, 900), (1280, 720)
 ]
 
+# Persistent profile directory name under the profiles dir
+PROFILE_NAME = "primary"
+
+# Consecutive soft restarts (new tab) before falling back to a full relaunch
+MAX_SOFT_RESTARTS = 2
+
+# Static launch flags, built once; only UA, window size, profile dir and
+# headless mode vary per launch
+CHROME_ARGS = (
+    # Stealth settings
+    "--disable-blink-features=AutomationControlled",
+    "--disable-dev-shm-usage",
+    "--no-sandbox",
+    "--disable-gpu",
+    "--disable-extensions",
+    "--disable-infobars",
+    "--disable-notifications",
+    "--disable-popup-blocking",
+    # Performance settings: no image decoding or web font downloads at all;
+    # remaining heavy requests and trackers are blocked via CDP after launch
+    # (see _apply_network_blocking)
+    "--blink-settings=imagesEnabled=false",
+    "--disable-remote-fonts",
+    # CPU/memory optimization
+    "--renderer-process-limit=1",
+    "--disable-features=IsolateOrigins,site-per-process",
+    "--disable-backgrounding-occluded-windows",
+    "--disable-renderer-backgrounding",
+    "--disable-background-timer-throttling",
+    "--disable-background-networking",
+    "--enable-low-end-device-mode",
+    "--mute-audio",
+    "--log-level=3",
+    # Crash prevention
+    "--disable-crash-reporter",
+    "--disable-breakpad",
+)
+
+# Minimal flags for the retry after a crashed launch
+CHROME_FALLBACK_ARGS = (
+    "--disable-blink-features=AutomationControlled",
+    "--no-sandbox",
+    "--disable-gpu",
+    "--mute-audio",
+)
+
+EDGE_ARGS = (
+    "--disable-blink-features=AutomationControlled",
+    "--disable-dev-shm-usage",
+    "--no-sandbox",
+    "--disable-gpu",
+    "--disable-extensions",
+    "--blink-settings=imagesEnabled=false",
+    "--disable-remote-fonts",
+    "--mute-audio",
+    "--log-level=3",
+)
+
+EDGE_FALLBACK_ARGS = (
+    "--disable-blink-features=AutomationControlled",
+    "--no-sandbox",
+    "--mute-audio",
+)
+
+EXCLUDE_SWITCHES = ["enable-automation", "enable-logging"]
+
+# Chrome lock files left behind by crashed sessions
+PROFILE_LOCK_PATTERNS = ("Singleton*", "lockfile", "*/Singleton*", "*/lockfile")
+
+# Heavy resources and trackers blocked at the network layer via CDP
+# NOTE: Do NOT block stylesheets - Ozon needs CSS for proper rendering
+BLOCKED_URL_PATTERNS = [
+    "*.png", "*.jpg", "*.jpeg", "*.webp", "*.gif", "*.svg", "*.ico",
+    "*.mp4", "*.webm", "*.woff", "*.woff2", "*.ttf", "*.otf",
+    "*mc.yandex*", "*google-analytics*", "*facebook*", "*vk.com/rtrg*",
+    "*top-fwz*", "*criteo*", "*mediator.mail.ru*",
+]
+
+# Cookies Ozon sets once the anti-bot check has passed; kept in the profile
+ANTIBOT_COOKIES = frozenset({"abt_data", "__cf_bm"})
+
+
+class BrowserInfo(NamedTuple):
+    """Detected browser type and binary path (None = let the driver find it)."""
+    browser_type: str
+    path: Optional[str]
+
+
+class PageStatus(NamedTuple):
+    """Captcha/block flags plus product link count (-1 = unknown) from one probe."""
+    is_captcha: bool
+    is_blocked: bool
+    product_count: int
 
+
+@functools.lru_cache(maxsize=1)
 def _get_profiles_dir() -> Path:
     """Get the directory for browser profiles."""
     if os.name == 'nt':  # Windows
@@ -82,33 +179,68 @@ def _get_profiles_dir() -> Path:
 
 
 def _cleanup_profile_locks(profile_path: Path) -> None:
-    """Clean up Chrome profile lock files."""
-    lock_files = ["SingletonLock", "SingletonSocket", "SingletonCookie", "lockfile"]
-
-    for lock_file in lock_files:
-        lock_path = profile_path / lock_file
-        if lock_path.exists():
+    """Clean up Chrome profile lock files (profile root and its per-profile dirs)."""
+    # Only one level deep - a recursive glob would walk the whole HTTP cache
+    for pattern in PROFILE_LOCK_PATTERNS:
+        for lock_path in profile_path.glob(pattern):
             try:
-                lock_path.unlink()
-                logger.debug(f"Removed lock: {lock_file}")
+                lock_path.unlink(missing_ok=True)
+                logger.debug(f"Removed lock: {lock_path.relative_to(profile_path)}")
             except Exception:
                 pass
 
-    default_dir = profile_path / "Default"
-    if default_dir.exists():
-        for lock_file in lock_files:
-            lock_path = default_dir / lock_file
-            if lock_path.exists():
-                try:
-                    lock_path.unlink()
-                except Exception:
-                    pass
 
+def _browser_pids(driver: Any) -> List[int]:
+    """
+    chromedriver PID plus the browser processes it spawned.
+    Empty without psutil - the children can't be listed, so cleanup falls
+    back to the name match.
+    """
+    try:
+        import psutil
+        driver_pid = driver.service.process.pid
+        children = psutil.Process(driver_pid).children(recursive=True)
+    except Exception:
+        return []
+    return [driver_pid] + [child.pid for child in children]
+
+
+def _kill_browser_pids(pids: List[int]) -> Optional[int]:
+    """
+    Kill this instance's recorded browser processes.
+    Returns number of processes killed, or None if nothing was recorded.
+    """
+    if not pids:
+        return None
+    import psutil  # Only recorded when psutil is available
 
-def _kill_zombie_chrome_processes() -> int:
-    """Kill zombie Chrome processes that may be holding locks."""
     killed = 0
+    for pid in pids:
+        try:
+            proc = psutil.Process(pid)
+            # Process may have exited and its PID been reused since launch
+            name = proc.name().lower()
+            if not any(marker in name for marker in ("chrome", "msedge")):
+                continue
+            proc.kill()
+            killed += 1
+        except Exception:
+            pass
+
+    if killed:
+        logger.info(f"Killed {killed} leftover browser processes")
+    return killed
 
+
+def _kill_zombie_chrome_processes(pids: Optional[List[int]] = None) -> int:
+    """Kill zombie Chrome processes that may be holding locks."""
+    killed = _kill_browser_pids(pids or [])
+    if killed is not None:
+        return killed
+
+    # Nothing recorded for this instance (first launch or no psutil) - match by
+    # name, and on Windows by our profile dir in the browser command line
+    killed = 0
     if os.name == 'nt':  # Windows
         try:
             result = subprocess.run(
@@ -123,23 +255,21 @@ def _kill_zombie_chrome_processes() -> int:
         except Exception:
             pass
 
+        # Browsers left by a crashed earlier run still hold the persistent
+        # profile's lock - find them by our profile dir on the command line
         try:
             import psutil
-            our_markers = ["ozon-parser", "selenium-profiles"]
 
             for proc in psutil.process_iter(['pid', 'name', 'cmdline']):
                 try:
                     proc_name = (proc.info.get('name') or '').lower()
-                    if 'chrome' in proc_name:
-                        cmdline = proc.info.get('cmdline') or []
-                        cmdline_str = ' '.join(cmdline) if cmdline else ''
-
-                        for marker in our_markers:
-                            if marker in cmdline_str:
-                                proc.kill()
-                                killed += 1
-                                logger.info(f"Killed Chrome (PID: {proc.info['pid']})")
-                                break
+                    if not any(marker in proc_name for marker in ("chrome", "msedge")):
+                        continue
+                    cmdline_str = ' '.join(proc.info.get('cmdline') or [])
+                    if 'selenium-profiles' in cmdline_str:
+                        proc.kill()
+                        killed += 1
+                        logger.info(f"Killed browser (PID: {proc.info['pid']})")
                 except Exception:
                     pass
         except ImportError:
@@ -164,6 +294,7 @@ def _get_random_fingerprint() -> Dict[str, Any]:
     return {
         "width": res[0],
         "height": res[1],
+        "chrome_version": chrome_version,
         "user_agent": (
             f"Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
             f"AppleWebKit/537.36 (KHTML, like Gecko) "
@@ -172,8 +303,9 @@ def _get_random_fingerprint() -> Dict[str, Any]:
     }
 
 
-def _detect_available_browser() -> Tuple[str, Optional[str]]:
-    """Detect which browser is available on the system."""
+@functools.lru_cache(maxsize=1)
+def _detect_available_browser() -> BrowserInfo:
+    """Detect which browser is available on the system (cached per process)."""
     if sys.platform == "darwin":  # macOS
         chrome_paths = [
             "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
@@ -183,10 +315,10 @@ def _detect_available_browser() -> Tuple[str, Optional[str]]:
         for path in chrome_paths:
             if os.path.exists(path):
                 logger.info(f"Found Chrome at: {path}")
-                return ("chrome", path)
+                return BrowserInfo("chrome", path)
 
         logger.info("No browser found at common paths, trying default Chrome")
-        return ("chrome", None)
+        return BrowserInfo("chrome", None)
 
     elif sys.platform == "win32":  # Windows
         chrome_paths = [
@@ -203,15 +335,15 @@ def _detect_available_browser() -> Tuple[str, Optional[str]]:
         for path in chrome_paths:
             if os.path.exists(path):
                 logger.info(f"Found Chrome at: {path}")
-                return ("chrome", path)
+                return BrowserInfo("chrome", path)
 
         for path in edge_paths:
             if os.path.exists(path):
                 logger.info(f"Found Edge at: {path}")
-                return ("edge", path)
+                return BrowserInfo("edge", path)
 
         logger.info("No browser found at common paths, trying default Chrome")
-        return ("chrome", None)
+        return BrowserInfo("chrome", None)
 
     else:  # Linux
         chrome_paths = [
@@ -224,10 +356,289 @@ def _detect_available_browser() -> Tuple[str, Optional[str]]:
         for path in chrome_paths:
             if os.path.exists(path):
                 logger.info(f"Found Chrome at: {path}")
-                return ("chrome", path)
+                return BrowserInfo("chrome", path)
 
         logger.info("No browser found at common paths, trying default Chrome")
-        return ("chrome", None)
+        return BrowserInfo("chrome", None)
+
+
+# Navigator/WebGL patches, identical for every fingerprint. Fingerprint-specific
+# values (UA, screen size, timezone) are applied through Emulation.* instead.
+_STEALTH_JS = """
+    Object.defineProperty(navigator, 'webdriver', {get: () => undefined});
+    Object.defineProperty(navigator, 'plugins', {get: () => [1, 2, 3, 4, 5]});
+    Object.defineProperty(navigator, 'languages', {get: () => ['ru-RU', 'ru', 'en-US', 'en']});
+    window.chrome = {runtime: {}};
+    Object.defineProperty(navigator, 'hardwareConcurrency', {get: () => 8});
+    Object.defineProperty(navigator, 'deviceMemory', {get: () => 8});
+
+    // WebGL spoofing
+    const getParameterProxyHandler = {
+        apply: function(target, thisArg, args) {
+            const param = args[0];
+            if (param === 37445) return 'Google Inc. (NVIDIA)';
+            if (param === 37446) return 'ANGLE (NVIDIA, NVIDIA GeForce GTX 1080 Direct3D11 vs_5_0 ps_5_0, D3D11)';
+            return Reflect.apply(target, thisArg, args);
+        }
+    };
+
+    ['WebGLRenderingContext', 'WebGL2RenderingContext'].forEach(ctx => {
+        if (window[ctx]) {
+            const proto = window[ctx].prototype;
+            const originalGetParameter = proto.getParameter;
+            proto.getParameter = new Proxy(originalGetParameter, getParameterProxyHandler);
+        }
+    });
+
+    // Hide automation
+    delete window.__selenium_unwrapped;
+    delete window.__driver_evaluate;
+    delete document.$cdc_asdjflasutopfhvcZLmcfl_;
+""".strip()
+
+
+def _apply_stealth(driver: Any, fingerprint: Dict[str, Any]) -> None:
+    """
+    Apply UA, timezone, locale and navigator patches in one CDP sequence.
+
+    UA client hints and timezone are set via Emulation.* so they also hold in
+    iframes and workers, where JS prototype patches don't reach.
+    """
+    version = str(fingerprint["chrome_version"])
+    driver.execute_cdp_cmd("Emulation.setUserAgentOverride", {
+        "userAgent": fingerprint["user_agent"],
+        "acceptLanguage": "ru-RU,ru;q=0.9,en-US;q=0.8,en;q=0.7",
+        "platform": "Win32",
+        "userAgentMetadata": {
+            "brands": [
+                {"brand": "Google Chrome", "version": version},
+                {"brand": "Chromium", "version": version},
+                {"brand": "Not_A Brand", "version": "24"},
+            ],
+            "fullVersion": f"{version}.0.0.0",
+            "platform": "Windows",
+            "platformVersion": "10.0.0",
+            "architecture": "x86",
+            "model": "",
+            "mobile": False,
+        },
+    })
+    # Screen matches --window-size; width/height 0 leaves the viewport alone
+    driver.execute_cdp_cmd("Emulation.setDeviceMetricsOverride", {
+        "width": 0,
+        "height": 0,
+        "deviceScaleFactor": 0,
+        "mobile": False,
+        "screenWidth": fingerprint["width"],
+        "screenHeight": fingerprint["height"],
+    })
+    driver.execute_cdp_cmd("Emulation.setTimezoneOverride", {"timezoneId": "Europe/Moscow"})
+    try:
+        driver.execute_cdp_cmd("Emulation.setLocaleOverride", {"locale": "ru-RU"})
+    except Exception as e:
+        # Locale override fails if one is already active for the target
+        logger.debug(f"Locale override skipped: {e}")
+    driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {
+        "source": _STEALTH_JS
+    })
+
+
+# Product ID extraction, registered once per document as window.__ozonCollect so
+# the hot collect loop only sends a one-line call instead of re-parsing the body
+_COLLECT_PRODUCTS_FN = """
+    function(seenSet) {
+        const ids = [];
+        // DOM pre-filters product links; one regex replaces the substring chain
+        const productRe = /\\/product\\/[^?#]*-(\\d+)\\/?(?:[?#]|$)/;
+        const links = document.querySelectorAll('a[href*="/product/"]');
+        for (let i = 0; i < links.length; i++) {
+            const href = links[i].href;
+            if (href.includes('/reviews') || href.includes('/questions')) continue;
+            const match = productRe.exec(href);
+            if (!match) continue;
+            const id = match[1];
+            if (seenSet.has(id)) continue;
+            seenSet.add(id);
+            ids.push(id);
+        }
+        return ids;
+    }
+"""
+
+# Captcha/block detection and product link count over the current DOM
+_PAGE_STATUS_FN = """
+    function() {
+        const isCaptcha = /бот|robot|bot|captcha|подтверд|confirm|antibot|challenge/i.test(document.title);
+        const h1 = document.querySelector('h1');
+        const isBlocked = !!h1 && h1.innerText.toLowerCase().includes('доступ ограничен');
+        const productCount = document.querySelectorAll('a[href*="/product/"]').length;
+        return { isCaptcha: isCaptcha, isBlocked: isBlocked, productCount: productCount };
+    }
+"""
+
+_PAGE_HELPERS_JS = """
+    // IDs already returned from this document stay here, so Python never has
+    // to send its seen list back on every scroll
+    (() => {
+        const collect = %(collect)s;
+        const seen = new Set();
+        Object.defineProperty(window, '__ozonCollect', {
+            value: () => collect(seen),
+            enumerable: false,
+            configurable: true
+        });
+    })();
+
+    // Page status is recomputed only after the DOM has changed since the last read
+    (() => {
+        const computeStatus = %(status)s;
+        let dirty = true;
+        let status = { isCaptcha: false, isBlocked: false };
+        new MutationObserver(() => { dirty = true; }).observe(document, {
+            subtree: true, childList: true, characterData: true
+        });
+        Object.defineProperty(window, '__ozonStatus', {
+            value: () => {
+                if (dirty) {
+                    status = computeStatus();
+                    dirty = false;
+                }
+                return status;
+            },
+            enumerable: false,
+            configurable: true
+        });
+    })();
+""" % {"collect": _COLLECT_PRODUCTS_FN, "status": _PAGE_STATUS_FN}
+
+_COLLECT_PRODUCTS_CALL = "return window.__ozonCollect ? window.__ozonCollect() : null;"
+_COLLECT_PRODUCTS_FALLBACK = "return (%s)(new Set());" % _COLLECT_PRODUCTS_FN
+
+_PAGE_STATUS_CALL = "return window.__ozonStatus ? window.__ozonStatus() : null;"
+_PAGE_STATUS_FALLBACK = "return (%s)();" % _PAGE_STATUS_FN
+
+# Async script: resolves true once the block page is gone, false on timeout
+_WAIT_UNBLOCKED_JS = """
+    const timeoutMs = arguments[0];
+    const done = arguments[arguments.length - 1];
+    const isBlocked = () => {
+        const h1 = document.querySelector('h1');
+        return !!h1 && h1.innerText.toLowerCase().includes('доступ ограничен');
+    };
+    if (!isBlocked()) {
+        done(true);
+        return;
+    }
+    const observer = new MutationObserver(() => {
+        if (!isBlocked()) {
+            observer.disconnect();
+            clearTimeout(timer);
+            done(true);
+        }
+    });
+    const timer = setTimeout(() => {
+        observer.disconnect();
+        done(false);
+    }, timeoutMs);
+    observer.observe(document, { subtree: true, childList: true, characterData: true });
+"""
+
+# Async script: resolves elapsed ms once the body outgrows the JS challenge, -1 on timeout
+_WAIT_BODY_JS = """
+    const [timeoutMs, minLength] = arguments;
+    const done = arguments[arguments.length - 1];
+    const t0 = Date.now();
+    (function poll() {
+        if (document.body && document.body.innerHTML.length > minLength) return done(Date.now() - t0);
+        if (Date.now() - t0 > timeoutMs) return done(-1);
+        setTimeout(poll, 250);
+    })();
+"""
+
+# Async script: resolves true once a product link is in the DOM, false on timeout
+_WAIT_PRODUCTS_JS = """
+    const timeoutMs = arguments[0];
+    const done = arguments[arguments.length - 1];
+    const hasProducts = () => !!document.querySelector("a[href*='/product/']");
+    if (hasProducts()) {
+        done(true);
+        return;
+    }
+    const observer = new MutationObserver(() => {
+        if (hasProducts()) {
+            observer.disconnect();
+            clearTimeout(timer);
+            done(true);
+        }
+    });
+    const timer = setTimeout(() => {
+        observer.disconnect();
+        done(false);
+    }, timeoutMs);
+    observer.observe(document, { subtree: true, childList: true });
+"""
+
+# Pinning the first kept tile in the viewport keeps the scroll position steady
+_TRIM_RESULTS_CALL = f"return ({TRIM_RESULTS_JS})(arguments);"
+
+# Async script: smooth scroll, pause, optional extra scroll - one round-trip
+_SCROLL_JS = """
+    const [mainDelta, mainPause, extraDelta, extraPause] = arguments;
+    const done = arguments[arguments.length - 1];
+    const scrollThenWait = (delta, pause) => new Promise(resolve => {
+        requestAnimationFrame(() => {
+            window.scrollBy({ top: delta, behavior: 'smooth' });
+            setTimeout(resolve, pause);
+        });
+    });
+    (async () => {
+        await scrollThenWait(mainDelta, mainPause);
+        if (extraDelta) {
+            await scrollThenWait(extraDelta, extraPause);
+        }
+    })().then(() => done(true), () => done(false));
+"""
+
+# Async script: resolves true once the title stops looking like a captcha
+_WAIT_CAPTCHA_SOLVED_JS = """
+    const timeoutMs = arguments[0];
+    const done = arguments[arguments.length - 1];
+    const captchaRe = /бот|robot|bot|captcha|подтверд|confirm|antibot|challenge/i;
+    const isCaptcha = () => captchaRe.test(document.title);
+    if (!isCaptcha()) {
+        done(true);
+        return;
+    }
+    const observer = new MutationObserver(() => {
+        if (!isCaptcha()) {
+            observer.disconnect();
+            clearTimeout(timer);
+            done(true);
+        }
+    });
+    const timer = setTimeout(() => {
+        observer.disconnect();
+        done(false);
+    }, timeoutMs);
+    observer.observe(document, { subtree: true, childList: true, characterData: true });
+"""
+
+
+def _install_page_helpers(driver: Any) -> None:
+    """Register page helper functions for every new document."""
+    driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {
+        "source": _PAGE_HELPERS_JS
+    })
+
+
+def _apply_network_blocking(driver: Any) -> None:
+    """Block images, media, fonts and trackers before any request is made."""
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+        driver.execute_cdp_cmd("Page.setDownloadBehavior", {"behavior": "deny"})
+    except Exception as e:
+        logger.debug(f"Network blocking not applied: {e}")
 
 
 def _get_driver_service(browser_type: str) -> Any:
@@ -267,10 +678,6 @@ class SeleniumPage:
         """No-op for Selenium - we reuse the same driver."""
         pass
 
-    async def wait_for_timeout(self, ms: int) -> None:
-        """Wait for specified milliseconds."""
-        await asyncio.sleep(ms / 1000)
-
 
 class OzonParserSelenium:
     """
@@ -284,6 +691,9 @@ class OzonParserSelenium:
     - CPU/memory optimizations
     """
 
+    # One driver serves every page, so PositionTracker must not run tasks in parallel
+    MAX_WORKERS = 1
+
     def __init__(self) -> None:
         """Initialize parser."""
         if not SELENIUM_AVAILABLE:
@@ -293,9 +703,16 @@ class OzonParserSelenium:
             )
 
         self._driver: Any = None
+        self._fingerprint: Dict[str, Any] = {}
+        self._soft_restarts = 0  # Consecutive soft restarts since last relaunch
+        self._chrome_pids: List[int] = []  # chromedriver + browser PIDs of this instance
+        self._executor: ThreadPoolExecutor | None = None
         self._restart_lock: asyncio.Lock | None = None
+        self.restart_generation = 0  # Bumped by every restart_browser()
+        self.idle_pages: list = []  # Warm tabs handed back by finished trackers
         self._profiles_dir = _get_profiles_dir()
-        self._profile_path: Path | None = None
+        # Single persistent profile keeps HTTP cache, TLS tickets and HSTS warm
+        self._profile_path: Path = self._profiles_dir / PROFILE_NAME
 
     def _get_lock(self) -> asyncio.Lock:
         """Get or create restart lock."""
@@ -303,14 +720,27 @@ class OzonParserSelenium:
             self._restart_lock = asyncio.Lock()
         return self._restart_lock
 
+    async def _run(self, fn: Any, *args: Any) -> Any:
+        """Run a blocking WebDriver call on the driver's dedicated thread.
+
+        WebDriver is not thread-safe, so every call goes through a single
+        worker instead of the shared default executor.
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="selenium-drv")
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
     def _create_driver(self, fingerprint: Dict[str, Any], profile_path: Optional[Path] = None) -> Any:
         """Create Chrome/Edge WebDriver with stealth settings."""
         browser_type, browser_path = _detect_available_browser()
 
         if browser_type == "edge":
-            return self._create_edge_driver(fingerprint, profile_path, browser_path)
+            driver = self._create_edge_driver(fingerprint, profile_path, browser_path)
         else:
-            return self._create_chrome_driver(fingerprint, profile_path, browser_path)
+            driver = self._create_chrome_driver(fingerprint, profile_path, browser_path)
+
+        self._chrome_pids = _browser_pids(driver)
+        return driver
 
     def _create_chrome_driver(
         self,
@@ -336,49 +766,22 @@ class OzonParserSelenium:
             else:
                 options.add_argument("--headless")
 
-        # Stealth settings
-        options.add_argument("--disable-blink-features=AutomationControlled")
-        options.add_argument("--disable-dev-shm-usage")
-        options.add_argument("--no-sandbox")
-        options.add_argument("--disable-gpu")
-        options.add_argument("--disable-extensions")
-        options.add_argument("--disable-infobars")
-        options.add_argument("--disable-notifications")
-        options.add_argument("--disable-popup-blocking")
+        for arg in CHROME_ARGS:
+            options.add_argument(arg)
         options.add_argument(f"--user-agent={fingerprint['user_agent']}")
         options.add_argument(f"--window-size={fingerprint['width']},{fingerprint['height']}")
 
-        # Performance settings
-        prefs = {
-            "profile.managed_default_content_settings.images": 2,  # Block images
-            "profile.default_content_setting_values.notifications": 2,
-        }
-        options.add_experimental_option("prefs", prefs)
-
-        # CPU/memory optimization
-        options.add_argument("--renderer-process-limit=1")
-        options.add_argument("--disable-features=IsolateOrigins,site-per-process")
-        options.add_argument("--disable-backgrounding-occluded-windows")
-        options.add_argument("--disable-renderer-backgrounding")
-        options.add_argument("--disable-background-timer-throttling")
-        options.add_argument("--disable-background-networking")
-        options.add_argument("--enable-low-end-device-mode")
-        options.add_argument("--mute-audio")
-        options.add_argument("--log-level=3")
-
-        # Crash prevention
-        options.add_argument("--disable-crash-reporter")
-        options.add_argument("--disable-breakpad")
-
         # Exclude automation flags
-        options.add_experimental_option("excludeSwitches", ["enable-automation", "enable-logging"])
+        options.add_experimental_option("excludeSwitches", EXCLUDE_SWITCHES)
         options.add_experimental_option("useAutomationExtension", False)
 
         # Get driver service
         service = _get_driver_service("chrome")
 
+        # keep_alive pinned explicitly: every WebDriver command reuses one
+        # persistent connection to chromedriver instead of a new TCP handshake
         try:
-            driver = webdriver.Chrome(service=service, options=options)
+            driver = webdriver.Chrome(service=service, options=options, keep_alive=True)
             logger.info(f"Chrome launched (headless={settings.browser_headless})")
         except Exception as e:
             error_msg = str(e)
@@ -386,7 +789,7 @@ class OzonParserSelenium:
 
             if "crashed" in error_msg.lower() or "session not created" in error_msg.lower():
                 logger.info("Killing zombie Chrome processes...")
-                _kill_zombie_chrome_processes()
+                _kill_zombie_chrome_processes(self._chrome_pids)
 
                 if profile_path:
                     _cleanup_profile_locks(profile_path)
@@ -400,57 +803,20 @@ class OzonParserSelenium:
 
                 if settings.browser_headless:
                     options.add_argument("--headless=new")
-                options.add_argument("--disable-blink-features=AutomationControlled")
-                options.add_argument("--no-sandbox")
-                options.add_argument("--disable-gpu")
-                options.add_argument("--mute-audio")
+                for arg in CHROME_FALLBACK_ARGS:
+                    options.add_argument(arg)
                 options.add_argument(f"--user-agent={fingerprint['user_agent']}")
-                options.add_experimental_option("excludeSwitches", ["enable-automation", "enable-logging"])
+                options.add_experimental_option("excludeSwitches", EXCLUDE_SWITCHES)
                 options.add_experimental_option("useAutomationExtension", False)
 
-                driver = webdriver.Chrome(service=service, options=options)
+                driver = webdriver.Chrome(service=service, options=options, keep_alive=True)
                 logger.info("Chrome launched (headless, no profile)")
             else:
                 raise e
 
-        # Execute stealth script
-        driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {
-            "source": """
-                Object.defineProperty(navigator, 'webdriver', {get: () => undefined});
-                Object.defineProperty(navigator, 'plugins', {get: () => [1, 2, 3, 4, 5]});
-                Object.defineProperty(navigator, 'languages', {get: () => ['ru-RU', 'ru', 'en-US', 'en']});
-                window.chrome = {runtime: {}};
-                Object.defineProperty(navigator, 'platform', {get: () => 'Win32'});
-                Object.defineProperty(navigator, 'hardwareConcurrency', {get: () => 8});
-                Object.defineProperty(navigator, 'deviceMemory', {get: () => 8});
-
-                // WebGL spoofing
-                const getParameterProxyHandler = {
-                    apply: function(target, thisArg, args) {
-                        const param = args[0];
-                        if (param === 37445) return 'Google Inc. (NVIDIA)';
-                        if (param === 37446) return 'ANGLE (NVIDIA, NVIDIA GeForce GTX 1080 Direct3D11 vs_5_0 ps_5_0, D3D11)';
-                        return Reflect.apply(target, thisArg, args);
-                    }
-                };
-
-                ['WebGLRenderingContext', 'WebGL2RenderingContext'].forEach(ctx => {
-                    if (window[ctx]) {
-                        const proto = window[ctx].prototype;
-                        const originalGetParameter = proto.getParameter;
-                        proto.getParameter = new Proxy(originalGetParameter, getParameterProxyHandler);
-                    }
-                });
-
-                // Timezone
-                Date.prototype.getTimezoneOffset = function() { return -180; };
-
-                // Hide automation
-                delete window.__selenium_unwrapped;
-                delete window.__driver_evaluate;
-                delete document.$cdc_asdjflasutopfhvcZLmcfl_;
-            """
-        })
+        _apply_stealth(driver, fingerprint)
+        _install_page_helpers(driver)
+        _apply_network_blocking(driver)
 
         return driver
 
@@ -474,29 +840,24 @@ class OzonParserSelenium:
         if settings.browser_headless:
             options.add_argument("--headless=new")
 
-        options.add_argument("--disable-blink-features=AutomationControlled")
-        options.add_argument("--disable-dev-shm-usage")
-        options.add_argument("--no-sandbox")
-        options.add_argument("--disable-gpu")
-        options.add_argument("--disable-extensions")
+        for arg in EDGE_ARGS:
+            options.add_argument(arg)
         options.add_argument(f"--user-agent={fingerprint['user_agent']}")
-        options.add_argument("--mute-audio")
-        options.add_argument("--log-level=3")
 
-        options.add_experimental_option("excludeSwitches", ["enable-automation", "enable-logging"])
+        options.add_experimental_option("excludeSwitches", EXCLUDE_SWITCHES)
         options.add_experimental_option("useAutomationExtension", False)
 
         service = _get_driver_service("edge")
 
         try:
-            driver = webdriver.Edge(service=service, options=options)
+            driver = webdriver.Edge(service=service, options=options, keep_alive=True)
             logger.info("Edge launched (headless)")
         except Exception as e:
             error_msg = str(e)
             logger.warning(f"Edge launch failed: {error_msg[:100]}")
 
             if "crashed" in error_msg.lower() or "session not created" in error_msg.lower():
-                _kill_zombie_chrome_processes()
+                _kill_zombie_chrome_processes(self._chrome_pids)
                 if profile_path:
                     _cleanup_profile_locks(profile_path)
                 time.sleep(2)
@@ -505,36 +866,27 @@ class OzonParserSelenium:
                 if browser_path and os.path.exists(browser_path):
                     options.binary_location = browser_path
                 options.add_argument("--headless=new")
-                options.add_argument("--disable-blink-features=AutomationControlled")
-                options.add_argument("--no-sandbox")
-                options.add_argument("--mute-audio")
+                for arg in EDGE_FALLBACK_ARGS:
+                    options.add_argument(arg)
                 options.add_argument(f"--user-agent={fingerprint['user_agent']}")
-                options.add_experimental_option("excludeSwitches", ["enable-automation", "enable-logging"])
+                options.add_experimental_option("excludeSwitches", EXCLUDE_SWITCHES)
 
-                driver = webdriver.Edge(service=service, options=options)
+                driver = webdriver.Edge(service=service, options=options, keep_alive=True)
                 logger.info("Edge launched (headless, no profile)")
             else:
                 raise e
 
-        # Stealth script
-        driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {
-            "source": """
-                Object.defineProperty(navigator, 'webdriver', {get: () => undefined});
-                Object.defineProperty(navigator, 'plugins', {get: () => [1, 2, 3, 4, 5]});
-                window.chrome = {runtime: {}};
-                Date.prototype.getTimezoneOffset = function() { return -180; };
-            """
-        })
+        _apply_stealth(driver, fingerprint)
+        _install_page_helpers(driver)
+        _apply_network_blocking(driver)
 
         return driver
 
     async def __aenter__(self) -> "OzonParserSelenium":
-        fingerprint = _get_random_fingerprint()
-        self._profile_path = self._profiles_dir / f"profile_{random.randint(1000, 9999)}"
+        self._fingerprint = _get_random_fingerprint()
 
-        loop = asyncio.get_event_loop()
-        self._driver = await loop.run_in_executor(
-            None, self._create_driver, fingerprint, self._profile_path
+        self._driver = await self._run(
+            self._create_driver, self._fingerprint, self._profile_path
         )
 
         self._driver.set_page_load_timeout(settings.browser_timeout // 1000)
@@ -549,21 +901,35 @@ class OzonParserSelenium:
         """
         return SeleniumPage(self._driver)
 
+    async def _has_session_cookies(self) -> bool:
+        """Check the persistent profile for Ozon's anti-bot cookies, whatever page is open."""
+        try:
+            result = await self._run(
+                self._driver.execute_cdp_cmd, "Network.getCookies", {"urls": [settings.base_url]}
+            )
+        except Exception:
+            return False
+        return any(cookie.get("name") in ANTIBOT_COOKIES for cookie in result.get("cookies", []))
+
     async def _warmup(self, page: SeleniumPage) -> None:
         """Visit homepage before searching to look like a real user."""
+        # A profile from an earlier run already passed the challenge
+        if await self._has_session_cookies():
+            logger.debug("Warm profile, skipping homepage visit")
+            return
+
         try:
-            loop = asyncio.get_event_loop()
-            await loop.run_in_executor(None, lambda: self._driver.get(settings.base_url))
+            await self._run(self._driver.get, settings.base_url)
             await asyncio.sleep(random.uniform(0.5, 1.2))
 
             # Random mouse movement simulation via JS
-            await loop.run_in_executor(None, lambda: self._driver.execute_script("""
+            await self._run(self._driver.execute_script, """
                 var event = new MouseEvent('mousemove', {
                     clientX: Math.random() * 800 + 100,
                     clientY: Math.random() * 400 + 100
                 });
                 document.dispatchEvent(event);
-            """))
+            """)
             await asyncio.sleep(random.uniform(0.2, 0.5))
         except Exception:
             await asyncio.sleep(0.5)
@@ -574,21 +940,83 @@ class OzonParserSelenium:
                 self._driver.quit()
             except Exception as e:
                 logger.debug(f"Driver quit error: {e}")
+            self._chrome_pids = []
 
-        if self._profile_path and self._profile_path.exists():
-            try:
-                shutil.rmtree(self._profile_path)
-            except Exception as e:
-                logger.debug(f"Profile cleanup error: {e}")
+        if self._executor:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def _clear_site_data(self) -> bool:
+        """Clear Ozon cookies and storage, keeping the rest of the profile warm."""
+        try:
+            self._driver.execute_cdp_cmd("Storage.clearDataForOrigin", {
+                "origin": settings.base_url,
+                "storageTypes": "cookies,local_storage,indexeddb,service_workers,cache_storage",
+            })
+            self._driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+            return True
+        except Exception as e:
+            logger.debug(f"Site data clear failed: {e}")
+            return False
+
+    def _swap_tab(self) -> None:
+        """Clear site data, open a fresh tab and close the old one (blocking)."""
+        old_target_id = self._driver.current_window_handle
+        if not self._clear_site_data():
+            raise RuntimeError("site data clear failed")
+
+        # chromedriver window handles are CDP target IDs
+        new_target_id = self._driver.execute_cdp_cmd(
+            "Target.createTarget", {"url": "about:blank"}
+        )["targetId"]
+        self._driver.switch_to.window(new_target_id)
+        self._driver.execute_cdp_cmd("Target.closeTarget", {"targetId": old_target_id})
+
+        # Emulation overrides, init scripts and URL blocking are per-target
+        _apply_stealth(self._driver, self._fingerprint)
+        _install_page_helpers(self._driver)
+        _apply_network_blocking(self._driver)
+
+    async def soft_restart_browser(self) -> bool:
+        """
+        Replace the current tab with a fresh one and clean Ozon site data,
+        keeping the browser process warm. Returns False if it failed.
+        """
+        if not self._driver:
+            return False
+        try:
+            await self._run(self._swap_tab)
+        except Exception as e:
+            logger.warning(f"Soft restart failed: {e}")
+            return False
+        logger.info("Browser soft-restarted (new tab, clean site data)")
+        return True
+
+    async def restart_browser(self, generation: int | None = None) -> None:
+        """
+        Recover the browser: soft restart (fresh tab) first, full relaunch on the
+        same profile if that fails or soft restarts keep repeating.
 
-    async def restart_browser(self) -> None:
-        """Close browser, wipe profiles, and relaunch."""
+        Skipped if another caller already recovered it since `generation`.
+        """
         lock = self._get_lock()
 
         async with lock:
-            logger.info("Restarting browser with clean profile...")
+            if generation is not None and generation != self.restart_generation:
+                logger.debug("Browser already restarted by another tab")
+                return
+            if self._soft_restarts < MAX_SOFT_RESTARTS and await self.soft_restart_browser():
+                self._soft_restarts += 1
+                self.restart_generation += 1
+                self.idle_pages.clear()
+                return
+            self._soft_restarts = 0
+
+            logger.info("Restarting browser with clean site data...")
 
+            site_data_cleared = False
             if self._driver:
+                site_data_cleared = await self._run(self._clear_site_data)
                 try:
                     self._driver.quit()
                 except Exception:
@@ -596,163 +1024,200 @@ class OzonParserSelenium:
                 self._driver = None
 
             # Kill zombie processes
-            _kill_zombie_chrome_processes()
+            _kill_zombie_chrome_processes(self._chrome_pids)
+            self._chrome_pids = []
 
-            # Clean profile
-            if self._profiles_dir.exists():
+            # Driver was unreachable - fall back to wiping the profile
+            if not site_data_cleared and self._profile_path.exists():
                 try:
-                    shutil.rmtree(self._profiles_dir)
-                    logger.info("Deleted browser profiles")
+                    shutil.rmtree(self._profile_path)
+                    logger.info("Deleted browser profile")
                 except Exception as e:
-                    logger.warning(f"Failed to delete profiles: {e}")
-
-            self._profiles_dir.mkdir(parents=True, exist_ok=True)
+                    logger.warning(f"Failed to delete profile: {e}")
 
             # Relaunch
-            fingerprint = _get_random_fingerprint()
-            self._profile_path = self._profiles_dir / f"profile_{random.randint(1000, 9999)}"
+            self._fingerprint = _get_random_fingerprint()
 
-            loop = asyncio.get_event_loop()
-            self._driver = await loop.run_in_executor(
-                None, self._create_driver, fingerprint, self._profile_path
+            self._driver = await self._run(
+                self._create_driver, self._fingerprint, self._profile_path
             )
 
             self._driver.set_page_load_timeout(settings.browser_timeout // 1000)
             self._driver.set_script_timeout(60)
 
-            logger.info("Browser restarted with clean profile")
+            self.restart_generation += 1
+            # Pooled pages wrap the old driver
+            self.idle_pages.clear()
+            logger.info("Browser restarted")
 
     async def _is_captcha_page(self) -> bool:
         """Check if current page is a captcha challenge."""
         try:
-            loop = asyncio.get_event_loop()
-            title = await loop.run_in_executor(None, lambda: self._driver.title)
-            captcha_keywords = ["бот", "robot", "bot", "captcha", "подтверд", "confirm", "antibot", "challenge"]
-            return any(kw in title.lower() for kw in captcha_keywords)
+            title = await self._run(lambda: self._driver.title)
+            return bool(CAPTCHA_TITLE_RE.search(title))
         except Exception:
             return False
 
     async def _is_blocked_page(self) -> bool:
         """Check if we hit the 'Доступ ограничен' block page."""
         try:
-            loop = asyncio.get_event_loop()
-            result = await loop.run_in_executor(None, lambda: self._driver.execute_script("""
+            result = await self._run(self._driver.execute_script, """
                 const h1 = document.querySelector('h1');
                 return h1 && h1.innerText.toLowerCase().includes('доступ ограничен');
-            """))
+            """)
             return bool(result)
         except Exception:
             return False
 
-    async def _check_page_status(self) -> tuple[bool, bool]:
-        """Check for captcha and block in a single JS call."""
+    async def _check_page_status(self) -> PageStatus:
+        """Check for captcha, block and product link count in a single JS call."""
         try:
-            loop = asyncio.get_event_loop()
-            result = await loop.run_in_executor(None, lambda: self._driver.execute_script("""
-                const title = document.title.toLowerCase();
-                const captchaKeywords = ['бот', 'robot', 'bot', 'captcha', 'подтверд', 'confirm', 'antibot', 'challenge'];
-                const isCaptcha = captchaKeywords.some(kw => title.includes(kw));
-                const h1 = document.querySelector('h1');
-                const isBlocked = h1 && h1.innerText.toLowerCase().includes('доступ ограничен');
-                return { isCaptcha: isCaptcha, isBlocked: isBlocked };
-            """))
-            return result.get("isCaptcha", False), result.get("isBlocked", False)
+            # Served from the MutationObserver cache installed by the init script
+            result = await self._run(self._driver.execute_script, _PAGE_STATUS_CALL)
+            if result is None:
+                result = await self._run(self._driver.execute_script, _PAGE_STATUS_FALLBACK)
+            return PageStatus(
+                result.get("isCaptcha", False),
+                result.get("isBlocked", False),
+                result.get("productCount", -1),
+            )
         except Exception:
-            return False, False
+            return PageStatus(False, False, -1)
 
     async def _wait_for_captcha(self) -> None:
         """Wait for manual captcha solving."""
         logger.warning("Captcha/challenge detected!")
         logger.warning("Please solve captcha manually in the browser window...")
         logger.info("You have 60 seconds to solve the captcha")
-        for _ in range(60):
-            if not await self._is_captcha_page():
+
+        # One in-page wait per document instead of polling the title every second
+        deadline = time.monotonic() + 60
+        while (remaining := deadline - time.monotonic()) > 0:
+            try:
+                solved = await self._run(
+                    self._driver.execute_async_script, _WAIT_CAPTCHA_SOLVED_JS, int(remaining * 1000)
+                )
+            except Exception:
+                # Solving navigated to a new document (or script timeout) - re-check
+                await asyncio.sleep(0.5)
+                solved = False
+            if solved or not await self._is_captcha_page():
                 logger.info("Captcha solved!")
                 return
-            await asyncio.sleep(1)
         logger.warning("Captcha timeout - proceeding anyway...")
 
     async def _handle_block_page(self, max_retries: int = 3) -> bool:
         """Handle 'Доступ ограничен' block page."""
         logger.info("Block page detected, waiting for JS challenge to resolve...")
 
-        for i in range(5):
-            await asyncio.sleep(2)
-            if not await self._is_blocked_page():
-                logger.info(f"JS challenge resolved after {(i + 1) * 2}s")
-                return True
+        started = time.monotonic()
+        if await self._wait_until_unblocked(10):
+            logger.info(f"JS challenge resolved after {time.monotonic() - started:.1f}s")
+            return True
 
         for attempt in range(max_retries):
             if not await self._is_blocked_page():
                 return True
             logger.warning(f"Still blocked, refreshing (attempt {attempt + 1}/{max_retries})")
 
-            loop = asyncio.get_event_loop()
-            await loop.run_in_executor(None, self._driver.refresh)
-            await asyncio.sleep(5)
+            await self._run(self._driver.refresh)
+            if await self._wait_until_unblocked(5):
+                return True
 
         return not await self._is_blocked_page()
 
-    async def _collect_products_from_page(self, seen_products: set[str]) -> list[str]:
-        """Collect new product IDs from current page state."""
-        seen_list = list(seen_products) if len(seen_products) < 2000 else []
-
-        loop = asyncio.get_event_loop()
-        all_ids = await loop.run_in_executor(None, lambda: self._driver.execute_script("""
-            const seen = arguments[0];
-            const seenSet = new Set(seen);
-            const ids = [];
-            const links = document.getElementsByTagName('a');
-            for (let i = 0; i < links.length; i++) {
-                const href = links[i].href;
-                if (!href || !href.includes('/product/')) continue;
-                if (href.includes('/reviews') || href.includes('/questions')) continue;
-                const productIdx = href.indexOf('/product/');
-                if (productIdx === -1) continue;
-                const afterProduct = href.substring(productIdx + 9);
-                const queryIdx = afterProduct.indexOf('?');
-                const path = queryIdx > -1 ? afterProduct.substring(0, queryIdx) : afterProduct;
-                const lastDash = path.lastIndexOf('-');
-                if (lastDash === -1) continue;
-                const id = path.substring(lastDash + 1).replace(/\\/$/, '');
-                if (!/^\\d+$/.test(id)) continue;
-                if (!seenSet.has(id) && !ids.includes(id)) {
-                    ids.push(id);
-                }
-            }
-            return ids;
-        """, seen_list))
+    async def _wait_until_unblocked(self, timeout: float) -> bool:
+        """
+        Wait until the block page goes away or timeout expires.
 
-        for product_id in all_ids:
-            seen_products.add(product_id)
-        return all_ids
+        Resolves as soon as the DOM changes away from the block page instead of
+        sleeping for the full timeout.
+        """
+        try:
+            resolved = await self._run(
+                self._driver.execute_async_script, _WAIT_UNBLOCKED_JS, int(timeout * 1000)
+            )
+        except Exception:
+            # Challenge reloaded the page mid-wait - let the new document settle
+            await asyncio.sleep(0.5)
+            resolved = False
+        return bool(resolved) or not await self._is_blocked_page()
 
-    async def _scroll_page(self) -> None:
-        """Perform human-like scroll."""
-        loop = asyncio.get_event_loop()
+    async def _wait_in_page(self, script: str, timeout: float, *args: Any) -> Any:
+        """
+        Run an async wait script, passing it the remaining timeout in ms.
+
+        A navigation mid-wait (challenge redirect, late reload) unloads the
+        document and aborts the script - re-run it on the new document until
+        the deadline. Returns None if the deadline passes that way.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            try:
+                return await self._run(
+                    self._driver.execute_async_script, script, int(remaining * 1000), *args
+                )
+            except Exception as e:
+                if "unload" not in str(e).lower():
+                    raise
+                logger.debug("Document unloaded during wait, retrying on the new one")
+                await asyncio.sleep(0.5)
+
+    async def _wait_for_products(self, timeout: float) -> bool:
+        """Wait until product links appear, in a single round-trip per document."""
+        try:
+            return bool(await self._wait_in_page(_WAIT_PRODUCTS_JS, timeout))
+        except Exception as e:
+            logger.debug(f"Waiting for products failed: {e}")
+            return False
 
-        # Random mouse movement
-        await loop.run_in_executor(None, lambda: self._driver.execute_script("""
-            window.scrollBy({
-                top: arguments[0],
-                behavior: 'smooth'
-            });
-        """, random.randint(600, 1000)))
+    async def _collect_products_from_page(self, seen_products: set[str]) -> list[str]:
+        """Collect new product IDs from current page state."""
+        # Helper is parsed once per document by the init script; fall back to the
+        # inline function if the page was created before it was registered
+        all_ids = await self._run(self._driver.execute_script, _COLLECT_PRODUCTS_CALL)
+        if all_ids is None:
+            all_ids = await self._run(self._driver.execute_script, _COLLECT_PRODUCTS_FALLBACK)
+
+        # The page only dedupes within its own document - a reload after a
+        # block page starts over, so filter against everything seen so far
+        new_ids = [product_id for product_id in all_ids if product_id not in seen_products]
+        seen_products.update(new_ids)
+        return new_ids
+
+    async def _trim_results(self, seen_products: set[str]) -> None:
+        """Remove result tiles that were already collected, keeping the newest ones."""
+        try:
+            removed = await self._run(
+                self._driver.execute_script, _TRIM_RESULTS_CALL, TRIM_KEEP_TILES, list(seen_products)
+            )
+            if removed:
+                logger.debug(f"Trimmed {removed} result tiles")
+        except Exception as e:
+            logger.debug(f"Result trim failed: {e}")
 
-        await asyncio.sleep(random.uniform(0.4, 0.8))
+    async def _scroll_page(self) -> None:
+        """Perform human-like scroll (main scroll + sometimes extra) in one call."""
+        main_delta = random.randint(600, 1000)
+        main_pause_ms = random.randint(400, 800)
 
         # Sometimes extra scroll
+        extra_delta, extra_pause_ms = 0, 0
         if random.random() < 0.3:
-            await loop.run_in_executor(None, lambda: self._driver.execute_script("""
-                window.scrollBy({
-                    top: arguments[0],
-                    behavior: 'smooth'
-                });
-            """, random.randint(100, 300)))
-            await asyncio.sleep(random.uniform(0.2, 0.4))
+            extra_delta = random.randint(100, 300)
+            extra_pause_ms = random.randint(200, 400)
+
+        await self._run(
+            self._driver.execute_async_script, _SCROLL_JS, main_delta, main_pause_ms, extra_delta, extra_pause_ms
+        )
 
     async def find_product_position(
-        self, query: str, target_article: str, max_position: int = 1000, page: Any = None
+        self, query: str, target_article: str, max_position: int = 1000, page: Any = None,
+        serp: SerpEntry | None = None,
+        other_articles: frozenset[str] = frozenset(),
     ) -> int | None:
         """
         Search for a product position in Ozon search results using infinite scroll.
@@ -763,47 +1228,45 @@ class OzonParserSelenium:
             target_article: Product ID to find
             max_position: Maximum position to search
             page: Ignored for Selenium (kept for API compatibility with Playwright)
+            serp: Optional entry that receives every collected product ID in order;
+                serp.complete is set only if the scan covered max_position
+            other_articles: Articles to keep scrolling for before stopping early
         """
         # Note: page parameter is ignored - Selenium uses self._driver
         logger.info(f"Search: {query} -> {target_article}")
 
         seen_products: set[str] = set()
-        position = 0
+        scan = SerpScan(target_article, other_articles, max_position, serp)
         scroll_count = 0
 
         try:
-            search_url = f"{settings.base_url}/search/?text={query}"
-            loop = asyncio.get_event_loop()
+            search_url = build_search_url(query)
 
             try:
-                await loop.run_in_executor(None, lambda: self._driver.get(search_url))
+                await self._run(self._driver.get, search_url)
             except Exception as e:
                 if "Timeout" in str(e):
                     logger.warning("Page load timeout, waiting for products...")
-                    try:
-                        await loop.run_in_executor(None, lambda: WebDriverWait(self._driver, 30).until(
-                            EC.presence_of_element_located((By.CSS_SELECTOR, "a[href*='/product/']"))
-                        ))
-                        logger.info("Products loaded after extended wait")
-                    except Exception:
+                    if not await self._wait_for_products(30):
                         raise OzonPageLoadError(f"Page load timeout for query: {query}")
+                    logger.info("Products loaded after extended wait")
                 else:
                     raise OzonPageLoadError(f"Page load error: {e}")
 
             # Wait for JS challenge
-            body_length = await loop.run_in_executor(None, lambda: self._driver.execute_script(
-                "return document.body.innerHTML.length"
-            ))
+            body_length = await self._run(
+                self._driver.execute_script, "return document.body.innerHTML.length"
+            )
             if body_length < 5000:
                 logger.info(f"Small page ({body_length} chars), waiting for JS...")
-                for i in range(30):
-                    await asyncio.sleep(0.5)
-                    body_length = await loop.run_in_executor(None, lambda: self._driver.execute_script(
-                        "return document.body.innerHTML.length"
-                    ))
-                    if body_length > 10000:
-                        logger.info(f"JS challenge resolved after {(i+1)*0.5}s")
-                        break
+                # Poll inside the page instead of one round-trip per check
+                try:
+                    elapsed_ms = await self._wait_in_page(_WAIT_BODY_JS, 15, 10000)
+                except Exception as e:
+                    logger.debug(f"Waiting for JS challenge failed: {e}")
+                    elapsed_ms = None
+                if elapsed_ms is not None and elapsed_ms >= 0:
+                    logger.info(f"JS challenge resolved after {elapsed_ms / 1000:.1f}s")
 
             # Human-like delay
             await asyncio.sleep(random.uniform(0.3, 0.8))
@@ -818,70 +1281,74 @@ class OzonParserSelenium:
                 await self._wait_for_captcha()
 
             # Wait for products
-            try:
-                await loop.run_in_executor(None, lambda: WebDriverWait(self._driver, 15).until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, "a[href*='/product/']"))
-                ))
-            except Exception:
+            if not await self._wait_for_products(15):
                 raise OzonPageLoadError(f"No products found for query: {query}")
 
             # Collect initial products
             new_products = await self._collect_products_from_page(seen_products)
-
-            for product_id in new_products:
-                position += 1
-                if product_id == target_article:
-                    logger.info(f"Found {target_article} at position {position}")
-                    return position
+            if scan.add(new_products):
+                return scan.found
 
             # Infinite scroll loop
             empty_scrolls = 0
             max_empty_scrolls = 5
+            next_pause_at = next_reading_pause(scroll_count)
+            last_product_count = -1
 
-            while position < max_position:
+            while scan.position < max_position:
                 scroll_count += 1
 
                 await self._scroll_page()
 
-                # Random pause
-                if random.random() < 0.1:
+                # Reading pause
+                if scroll_count >= next_pause_at:
                     await asyncio.sleep(random.uniform(1.0, 2.0))
+                    next_pause_at = next_reading_pause(scroll_count)
 
                 # Check for captcha/block
-                is_captcha, is_blocked = await self._check_page_status()
+                is_captcha, is_blocked, product_count = await self._check_page_status()
                 if is_captcha:
                     await self._wait_for_captcha()
+                    last_product_count = -1
                     continue
                 if is_blocked:
                     if not await self._handle_block_page():
-                        return -1
+                        return scan.result_on_block()
+                    last_product_count = -1
                     continue
 
-                new_products = await self._collect_products_from_page(seen_products)
+                # Same link count as at the last collect - nothing new has loaded
+                if product_count >= 0 and product_count == last_product_count:
+                    new_products = []
+                else:
+                    new_products = await self._collect_products_from_page(seen_products)
+                last_product_count = product_count
 
                 if not new_products:
                     empty_scrolls += 1
                     if empty_scrolls >= max_empty_scrolls:
-                        return None
+                        return scan.found
                     continue
 
                 empty_scrolls = 0
-                logger.debug(f"Scroll {scroll_count}: +{len(new_products)} (total: {position + len(new_products)})")
-
-                for product_id in new_products:
-                    position += 1
-                    if product_id == target_article:
-                        logger.info(f"Found {target_article} at position {position}")
-                        return position
-                    if position >= max_position:
-                        return None
-
-            return None
-
-        except OzonBlockedError:
-            raise
-        except OzonPageLoadError:
-            raise
+                logger.debug(f"Scroll {scroll_count}: +{len(new_products)} (total: {scan.position + len(new_products)})")
+                if scan.add(new_products):
+                    return scan.found
+
+                if scan.position > TRIM_AFTER_POSITION and scroll_count % TRIM_EVERY_SCROLLS == 0:
+                    await self._trim_results(seen_products)
+                    last_product_count = -1
+
+            # Loop only ends here once max_position products were scanned
+            scan.mark_complete()
+            return scan.found
+
         except Exception as e:
+            if scan.found is not None:
+                # Target already located - a failure further down only costs the siblings
+                logger.warning(f"Scan for {query} aborted after finding {target_article}: {e}")
+                return scan.found
+            if isinstance(e, (OzonBlockedError, OzonPageLoadError)):
+                raise
             logger.exception(f"Search error: {e}")
             raise OzonPageLoadError(f"Search error: {e}")
@@ -1,6 +1,9 @@
 import asyncio
+import itertools
 import random
 import re
+import time
+from collections.abc import Iterator
 from dataclasses import dataclass
 from datetime import datetime
 
@@ -8,42 +11,171 @@ from playwright.async_api import Page
 
 from app.logging_config import get_logger
 from app.services.parser import OzonParser, OzonBlockedError, OzonPageLoadError
+from app.services.serp_cache import SerpCache, SerpEntry
 from app.services.sheets import GoogleSheetsService
+from app.settings import settings
 
 logger = get_logger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class SearchTask:
     row_index: int  # 1-based row number in sheet
     article: str
     query: str
 
 
+class AdaptiveLimiter:
+    """
+    AIMD cap on concurrent searches.
+
+    Starts low, allows one more search after every run of successes and
+    halves the cap when Ozon blocks or times out, so worker count settles
+    just under what Ozon tolerates.
+    """
+
+    def __init__(self, limit: int, max_limit: int, increase_after: int = 5) -> None:
+        self.max_limit = max(1, max_limit)
+        self.limit = min(max(1, limit), self.max_limit)
+        self._increase_after = increase_after
+        self._successes = 0
+        self._active = 0
+        self._cond = asyncio.Condition()
+
+    async def __aenter__(self) -> None:
+        async with self._cond:
+            await self._cond.wait_for(lambda: self._active < self.limit)
+            self._active += 1
+
+    async def __aexit__(self, *_) -> None:
+        async with self._cond:
+            self._active -= 1
+            self._cond.notify_all()
+
+    def record_success(self) -> None:
+        self._successes += 1
+        if self._successes >= self._increase_after and self.limit < self.max_limit:
+            self.limit += 1
+            self._successes = 0
+            logger.debug(f"Search concurrency raised to {self.limit}")
+
+    def record_block(self) -> None:
+        self._successes = 0
+        if self.limit > 1:
+            self.limit = max(1, self.limit // 2)
+            logger.debug(f"Search concurrency lowered to {self.limit}")
+
+
+class TokenBucket:
+    """
+    Pace search starts across workers.
+
+    Up to `capacity` searches may start back to back, after that one per
+    `interval` seconds. A search that itself took longer than the interval
+    has already paid for the next one, so no extra sleep is added.
+    """
+
+    def __init__(self, capacity: int, interval: float) -> None:
+        self.capacity = max(1, capacity)
+        self.interval = interval
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) / self.interval)
+            self._updated = now
+            if self._tokens < 1:
+                # Jitter keeps the request rhythm from looking machine-timed
+                await asyncio.sleep((1 - self._tokens) * self.interval * random.uniform(0.5, 1.5))
+                self._tokens = 1.0
+                self._updated = time.monotonic()
+            self._tokens -= 1
+
+
+class SearchThrottle:
+    """
+    Search load control shared by every tracker driving one parser.
+
+    Spreadsheets are tracked in parallel on the same browser and IP, so the
+    AIMD cap, the start pacing and the block counter the backoff grows with
+    must see all of their searches, not one spreadsheet's.
+    """
+
+    PACE_INTERVAL = 1.0  # Average seconds between search starts once the burst is used
+
+    def __init__(self, max_workers: int) -> None:
+        # Workers beyond the limiter's current cap wait until Ozon proves it copes
+        self.limiter = AdaptiveLimiter(limit=2, max_limit=max_workers)
+        self.pacer = TokenBucket(capacity=max_workers, interval=self.PACE_INTERVAL)
+        self.consecutive_blocks = 0
+
+    @classmethod
+    def for_parser(cls, parser: OzonParser) -> "SearchThrottle":
+        """Sized to the tabs one parser runs searches in at most."""
+        return cls(min(settings.tracker_workers, getattr(parser, "MAX_WORKERS", settings.tracker_workers)))
+
+
 class PositionTracker:
     WORKSHEET_NAME = "Позиции"
+    WRITE_BATCH_SIZE = 10  # Cells per batched Sheets write
+    WRITE_FLUSH_INTERVAL = 30.0  # Seconds before a partial batch is written anyway
+    BACKOFF_BASE = 2.0  # Seconds, doubled per consecutive block
+    BACKOFF_CAP = 60.0
+    RETRY_BACKOFF_CAP = 30.0
+    PAGE_ATTEMPTS = 3  # New-tab attempts before relaunching the browser
+    SHEETS_CONCURRENCY = 4  # Sheets writes in flight when no shared semaphore is passed
+    DATE_HEADER_RE = re.compile(r"^\d{2}\.\d{2}")  # Tracking column header (DD.MM ...)
 
     def __init__(
-        self, sheets_service: GoogleSheetsService, parser: OzonParser
+        self,
+        sheets_service: GoogleSheetsService,
+        parser: OzonParser,
+        sheets_semaphore: asyncio.Semaphore | None = None,
+        throttle: SearchThrottle | None = None,
     ) -> None:
         self.sheets = sheets_service
         self.parser = parser
+        # Trackers running in parallel share the caller's semaphore: each flush
+        # holds a default-executor thread for a full Sheets round trip
+        self._sheets_semaphore = sheets_semaphore or asyncio.BoundedSemaphore(self.SHEETS_CONCURRENCY)
         self._short_id: str = ""  # Set in run()
+        self._pending_cells: dict[tuple[int, int], dict] = {}  # (col, row) -> CellData
+        self._last_flush = time.monotonic()
+        self._not_found = ""  # "<max_position>+", set in run()
+        self._query_articles: dict[str, frozenset[str]] = {}  # Set in run()
+        self._serp_cache = SerpCache()
+        # Trackers sharing a parser in parallel share the caller's throttle too
+        self._throttle = throttle or SearchThrottle.for_parser(parser)
+        # Rows repeating an earlier (article, query) pair - filled from its result
+        self._duplicates: dict[tuple[str, str], list[SearchTask]] = {}
+
+    def _snapshot(self, worksheet) -> list[list[str]]:
+        """
+        Read columns A:D in a single request.
+
+        A (article), C (query) and D (latest tracking column, header included)
+        are all the planning step needs - the ever-growing history columns to
+        the right are skipped.
+        """
+        return worksheet.get("A1:D", pad_values=True)
 
-    def get_tasks_from_sheet(self) -> list[SearchTask]:
-        """Parse the sheet and return list of search tasks."""
-        worksheet = self.sheets.get_worksheet(self.WORKSHEET_NAME)
-        data = worksheet.get_all_values()
+    def get_tasks_from_sheet(self, data: list[list[str]] | None = None) -> list[SearchTask]:
+        """Parse the sheet (or an A:D snapshot of it) and return list of search tasks."""
+        if data is None:
+            data = self._snapshot(self.sheets.get_worksheet(self.WORKSHEET_NAME))
 
         tasks: list[SearchTask] = []
         current_article: str | None = None
 
-        for row_idx, row in enumerate(data[1:], start=2):  # Skip header, 1-based index
+        # Skip header without copying the snapshot; row_idx is 1-based
+        for row_idx, row in enumerate(itertools.islice(data, 1, None), start=2):
             if len(row) < 3:
                 continue
 
             article_cell = row[0].strip()
-            query_cell = row[2].strip()
 
             # If article cell has value, this is a product header row
             if article_cell:
@@ -51,8 +183,12 @@ class PositionTracker:
                 # Skip this row - it contains product name, not a search query
                 continue
 
-            # If no article but we have a current_article and a query
-            if current_article and query_cell:
+            # Rows before the first article can't become tasks - don't bother with C
+            if not current_article:
+                continue
+
+            query_cell = row[2].strip()
+            if query_cell:
                 tasks.append(
                     SearchTask(
                         row_index=row_idx,
@@ -65,18 +201,15 @@ class PositionTracker:
         return tasks
 
     def get_incomplete_tasks(
-        self, tasks: list[SearchTask], worksheet, col_idx: int
+        self, tasks: list[SearchTask], col_values: list[str]
     ) -> list[SearchTask]:
         """
-        Check column and return only tasks that have empty cells.
+        Check column values and return only tasks that have empty cells.
         If all cells are filled, returns empty list.
         """
         if not tasks:
             return []
 
-        # Get all values from column
-        col_values = worksheet.col_values(col_idx)
-
         # Find tasks with empty cells
         incomplete_tasks = []
         for task in tasks:
@@ -88,7 +221,7 @@ class PositionTracker:
         return incomplete_tasks
 
     def get_column_for_tracking(
-        self, tasks: list[SearchTask], worksheet
+        self, tasks: list[SearchTask], worksheet, data: list[list[str]]
     ) -> tuple[int, list[SearchTask]]:
         """
         Determine which column to use and which tasks to process.
@@ -97,17 +230,19 @@ class PositionTracker:
         1. Check if column D has incomplete tasks -> resume them
         2. If D is complete -> create new column at D, process all tasks
 
+        data is the A:D snapshot; only creating a new column talks to the API.
         Returns: (column_index, tasks_to_process)
         """
-        headers = worksheet.row_values(1)
+        headers = data[0] if data else []
 
         # Check if column D exists and has a date header (not A/B/C fixed columns)
         if len(headers) >= 4:
             header_d = headers[3]
             # Check if it looks like a date column (DD.MM format)
-            if re.match(r"^\d{2}\.\d{2}", header_d):
+            if self.DATE_HEADER_RE.match(header_d):
                 # Check for incomplete tasks in column D
-                incomplete = self.get_incomplete_tasks(tasks, worksheet, col_idx=4)
+                col_d = [row[3] if len(row) > 3 else "" for row in data]
+                incomplete = self.get_incomplete_tasks(tasks, col_d)
                 if incomplete:
                     return 4, incomplete
 
@@ -119,40 +254,86 @@ class PositionTracker:
         if len(headers) >= 4 and headers[3] == column_name:
             return 4, tasks
 
-        # Insert new column at position D
-        worksheet.insert_cols([[""]], col=4)
-        worksheet.update_cell(1, 4, column_name)
+        # Insert new column at position D with its header in the same request
+        worksheet.insert_cols([[column_name]], col=4, value_input_option="USER_ENTERED")
         return 4, tasks
 
+    def _queue_cell(self, row: int, col: int, value: str, is_found: bool = False) -> None:
+        """Queue a cell value for the next batch flush. Green background if found."""
+        # Set background color: green if found, white otherwise
+        if is_found:
+            bg_color = {"red": 0.7, "green": 1.0, "blue": 0.7}  # Light green
+        else:
+            bg_color = {"red": 1.0, "green": 1.0, "blue": 1.0}  # White
+
+        # Typed the way USER_ENTERED would parse it: positions are numbers,
+        # "1000+" and "—" stay text
+        if value.isdigit():
+            entered = {"numberValue": int(value)}
+        else:
+            entered = {"stringValue": value}
+
+        self._pending_cells[(col, row)] = {
+            "userEnteredValue": entered,
+            "userEnteredFormat": {"backgroundColor": bg_color},
+        }
+
     @staticmethod
-    def _col_letter(col_num: int) -> str:
-        """Convert column number (1-based) to letter (A, B, ..., Z, AA, AB, ...)."""
-        result = ""
-        while col_num > 0:
-            col_num, remainder = divmod(col_num - 1, 26)
-            result = chr(65 + remainder) + result
-        return result
-
-    async def _write_cell_async(
-        self, worksheet, row: int, col: int, value: str, is_found: bool = False
-    ) -> None:
-        """Write to cell asynchronously without blocking. Green background if found."""
-        try:
-            await asyncio.to_thread(worksheet.update_cell, row, col, value)
+    def _build_write_requests(sheet_id: int, cells: dict[tuple[int, int], dict]) -> list[dict]:
+        """One updateCells request per run of adjacent rows in the same column."""
+        requests: list[dict] = []
+        run_col = run_start = run_end = None
+        run_rows: list[dict] = []
+
+        def close_run() -> None:
+            if run_rows:
+                requests.append({
+                    "updateCells": {
+                        "range": {
+                            "sheetId": sheet_id,
+                            "startRowIndex": run_start - 1,
+                            "endRowIndex": run_end,
+                            "startColumnIndex": run_col - 1,
+                            "endColumnIndex": run_col,
+                        },
+                        "rows": run_rows,
+                        "fields": "userEnteredValue,userEnteredFormat.backgroundColor",
+                    }
+                })
+
+        for (col, row), cell in sorted(cells.items()):
+            if col != run_col or row != run_end + 1:
+                close_run()
+                run_col, run_start, run_rows = col, row, []
+            run_rows.append({"values": [cell]})
+            run_end = row
+        close_run()
+        return requests
+
+    async def _flush_writes(self, worksheet) -> None:
+        """Write all queued cells, values and formats, in one batchUpdate request."""
+        self._last_flush = time.monotonic()
+        if not self._pending_cells:
+            return
 
-            # Set background color: green if found, white otherwise
-            cell_label = f"{self._col_letter(col)}{row}"
-            if is_found:
-                bg_color = {"red": 0.7, "green": 1.0, "blue": 0.7}  # Light green
-            else:
-                bg_color = {"red": 1.0, "green": 1.0, "blue": 1.0}  # White
-            await asyncio.to_thread(
-                worksheet.format,
-                cell_label,
-                {"backgroundColor": bg_color}
-            )
+        cells, self._pending_cells = self._pending_cells, {}
+        requests = self._build_write_requests(worksheet.id, cells)
+        try:
+            async with self._sheets_semaphore:
+                await asyncio.to_thread(
+                    worksheet.spreadsheet.batch_update, {"requests": requests}
+                )
         except Exception as e:
-            logger.error(f"Failed to write to cell ({row}, {col}): {e}")
+            logger.error(f"Failed to write {len(cells)} cells: {e}")
+
+    def _backoff_delay(self) -> float:
+        """Full-jitter exponential backoff based on consecutive blocks."""
+        ceiling = min(self.BACKOFF_CAP, self.BACKOFF_BASE * 2 ** self._throttle.consecutive_blocks)
+        return random.uniform(0, ceiling)
+
+    def _retry_delay(self, attempt: int) -> float:
+        """Full-jitter exponential backoff for the n-th retry of one task."""
+        return random.uniform(0, min(self.RETRY_BACKOFF_CAP, self.BACKOFF_BASE * 2 ** attempt))
 
     async def _safe_close_page(self, page: Page) -> None:
         """Safely close page, ignoring errors if already closed."""
@@ -161,18 +342,65 @@ class PositionTracker:
         except Exception:
             pass
 
+    async def _acquire_page(self, worker_id: int) -> Page:
+        """Reuse a warm tab left by an earlier run on this parser, else open a fresh one."""
+        while self.parser.idle_pages:
+            page = self.parser.idle_pages.pop()
+            if not getattr(page, "is_closed", lambda: False)():
+                return page
+        return await self._get_fresh_page(worker_id)
+
     async def _get_fresh_page(self, worker_id: int) -> Page:
-        """Get a fresh page, handling browser restarts if needed."""
-        try:
-            page = await self.parser._new_page()
-            await self.parser._warmup(page)
-            return page
-        except Exception as e:
-            logger.warning(f"[Worker {worker_id}] Failed to create page, restarting browser: {e}")
-            await self.parser.restart_browser()
+        """Open a new tab in the running browser, relaunching it only as a last resort."""
+        # Trackers for other spreadsheets share this parser - whoever restarts
+        # first wins, the rest just open a tab in the new browser
+        generation = self.parser.restart_generation
+        page = None
+        for attempt in range(self.PAGE_ATTEMPTS):
+            try:
+                page = await self.parser._new_page()
+                break
+            except Exception as e:
+                logger.warning(
+                    f"[Worker {worker_id}] Failed to create page "
+                    f"(attempt {attempt + 1}/{self.PAGE_ATTEMPTS}): {e}"
+                )
+                if "closed" in str(e).lower():
+                    break  # Browser is gone - retrying a new tab won't help
+                await asyncio.sleep(1)
+
+        if page is None:
+            logger.warning(f"[Worker {worker_id}] Restarting browser")
+            await self.parser.restart_browser(generation)
             page = await self.parser._new_page()
-            await self.parser._warmup(page)
-            return page
+        await self.parser._warmup(page)
+        return page
+
+    async def _recover_page(
+        self, page: Page, worker_id: int, delay: float, reuse: bool = False
+    ) -> Page:
+        """
+        Replace a failed page with a fresh one, then wait `delay` before the retry.
+
+        With reuse=True the page is kept: the retry navigates it to the search
+        URL anyway, and skipping a new tab + warmup is much cheaper.
+        """
+        if not reuse:
+            await self._safe_close_page(page)
+            page = await self._get_fresh_page(worker_id)
+        await asyncio.sleep(delay)
+        return page
+
+    def _from_serp_cache(self, task: SearchTask, max_position: int) -> tuple[bool, int | None]:
+        """Answer a task from an already collected SERP. Returns (hit, position)."""
+        entry = self._serp_cache.get(task.query, max_position)
+        if entry is None:
+            return False, None
+        position = entry.position_of(task.article, max_position)
+        if position is None and not entry.complete:
+            # Earlier scan stopped early or stalled - this one may be further down
+            return False, None
+        return True, position
 
     async def _process_single_task(
         self,
@@ -186,53 +414,70 @@ class PositionTracker:
         """Process a single search task. Returns (task, result, page)."""
         logger.debug(f"[W{worker_id}] [{task_num}/{total_tasks}] {task.article}: {task.query}")
 
-        position = None
-        for attempt in range(3):
+        cache_hit, position = self._from_serp_cache(task, max_position)
+        # Other articles on this query are picked up by the same scan
+        others = self._query_articles.get(task.query, frozenset()) - {task.article}
+        if cache_hit:
+            logger.debug(f"[W{worker_id}] SERP cache hit: {task.query}")
+        for attempt in range(0 if cache_hit else 3):
+            serp = SerpEntry()
+            position = -1  # Reported as an error if every attempt fails
             try:
-                position = await self.parser.find_product_position(
-                    query=task.query,
-                    target_article=task.article,
-                    max_position=max_position,
-                    page=page,
-                )
+                await self._throttle.pacer.acquire()
+                async with self._throttle.limiter:
+                    position = await self.parser.find_product_position(
+                        query=task.query,
+                        target_article=task.article,
+                        max_position=max_position,
+                        page=page,
+                        serp=serp,
+                        other_articles=others,
+                    )
             except OzonBlockedError:
                 logger.warning(f"[Worker {worker_id}] Block detected")
-                await self._safe_close_page(page)
-                page = await self._get_fresh_page(worker_id)
-                await asyncio.sleep(random.uniform(5, 10))
+                self._throttle.consecutive_blocks += 1
+                self._throttle.limiter.record_block()
+                page = await self._recover_page(page, worker_id, self._backoff_delay())
                 continue
             except OzonPageLoadError as e:
                 logger.warning(f"[Worker {worker_id}] Page load error (attempt {attempt + 1}/3): {e}")
-                await self._safe_close_page(page)
-                page = await self._get_fresh_page(worker_id)
-                await asyncio.sleep(random.uniform(3, 6))
+                # A slow network usually leaves the tab usable - recycle it only if it fails again
+                page = await self._recover_page(
+                    page, worker_id, self._retry_delay(attempt), reuse=attempt == 0
+                )
                 continue
             except Exception as e:
                 error_str = str(e)
                 # Browser/context closed - get fresh page
                 if "closed" in error_str.lower() or "target" in error_str.lower():
                     logger.warning(f"[Worker {worker_id}] Browser closed, getting fresh page")
-                    page = await self._get_fresh_page(worker_id)
-                    await asyncio.sleep(random.uniform(2, 4))
+                    page = await self._recover_page(page, worker_id, self._retry_delay(attempt))
                     continue
                 if "ERR_TIMED_OUT" in error_str or "Timeout" in error_str:
                     logger.warning(f"[Worker {worker_id}] Timeout error (attempt {attempt + 1}/3): {e}")
-                    await self._safe_close_page(page)
-                    page = await self._get_fresh_page(worker_id)
-                    await asyncio.sleep(random.uniform(3, 6))
+                    self._throttle.limiter.record_block()
+                    page = await self._recover_page(
+                        page, worker_id, self._retry_delay(attempt), reuse=attempt == 0
+                    )
                     continue
                 logger.error(f"[Worker {worker_id}] Error processing query '{task.query}': {e}")
-                position = -1
                 break
 
             if position == -1:
                 # -1 means block page detected, retry with fresh browser
+                self._throttle.limiter.record_block()
                 if attempt < 2:
                     logger.warning(f"[Worker {worker_id}] Blocked during search, retrying...")
-                    await self._safe_close_page(page)
-                    page = await self._get_fresh_page(worker_id)
-                    await asyncio.sleep(random.uniform(3, 6))
+                    self._throttle.consecutive_blocks += 1
+                    page = await self._recover_page(page, worker_id, self._backoff_delay())
                     continue
+            else:
+                # Ozon is answering normally - let the backoff decay
+                self._throttle.consecutive_blocks = max(0, self._throttle.consecutive_blocks - 1)
+                self._throttle.limiter.record_success()
+                # The parser marks serp complete only when it reached max_position;
+                # partial scans still answer articles found in the scanned prefix
+                self._serp_cache.put(task.query, max_position, serp)
             break
 
         is_found = position is not None and position > 0
@@ -240,7 +485,7 @@ class PositionTracker:
             result = str(position)
             logger.info(f"[{self._short_id}] {task.article}: {result}")
         elif position is None:
-            result = f"{max_position}+"
+            result = self._not_found
             logger.info(f"[{self._short_id}] {task.article}: {result} (не найден)")
         else:
             result = "—"
@@ -248,20 +493,95 @@ class PositionTracker:
 
         return (task, result, page, is_found)
 
+    async def _worker(
+        self,
+        worker_id: int,
+        page: Page,
+        groups: Iterator[list[tuple[int, SearchTask]]],
+        results_queue: asyncio.Queue,
+        total_tasks: int,
+        max_position: int,
+    ) -> None:
+        """Take query groups until none are left, each worker on its own page."""
+        # Only a tab whose last search went through is worth keeping warm
+        reusable = False
+        try:
+            # Shared iterator: every next() hands the group to exactly one worker
+            for group in groups:
+                for task_num, task in group:
+                    # Searches are paced by the throttle's pacer; only stretch the gap while Ozon is blocking
+                    if self._throttle.consecutive_blocks and not self._from_serp_cache(task, max_position)[0]:
+                        await asyncio.sleep(self._backoff_delay())
+
+                    is_found = False
+                    reusable = False
+                    try:
+                        task, result, page, is_found = await self._process_single_task(
+                            task, task_num, total_tasks, max_position, page, worker_id=worker_id
+                        )
+                        reusable = result != "—"
+                    except Exception as e:
+                        logger.error(f"[{self._short_id}] [W{worker_id}] Fatal error: {e}")
+                        result = "—"
+                        try:
+                            page = await self._get_fresh_page(worker_id)
+                        except Exception:
+                            logger.error(f"[{self._short_id}] [W{worker_id}] Cannot recover, stopping")
+                            return
+
+                    # Sheets writes happen in _writer, never on a worker's time
+                    results_queue.put_nowait((task, result, is_found))
+        finally:
+            if reusable:
+                # Hand the warmed-up tab to the next run instead of closing it
+                self.parser.idle_pages.append(page)
+            else:
+                await self._safe_close_page(page)
+
+    async def _writer(
+        self, worksheet, col_idx: int, results_queue: asyncio.Queue, results: list
+    ) -> None:
+        """Drain worker results into batched Sheets writes until a None sentinel arrives."""
+        while True:
+            # Flush periodically so progress is visible in the sheet, also
+            # when slow searches keep the batch from filling up
+            timeout = max(0.0, self.WRITE_FLUSH_INTERVAL - (time.monotonic() - self._last_flush))
+            try:
+                item = await asyncio.wait_for(results_queue.get(), timeout)
+            except asyncio.TimeoutError:
+                await self._flush_writes(worksheet)
+                continue
+            if item is None:
+                break
+
+            task, result, is_found = item
+            for row_task in (task, *self._duplicates.get((task.article, task.query), ())):
+                results.append((row_task, result))
+                self._queue_cell(row_task.row_index, col_idx, result, is_found)
+            if len(self._pending_cells) >= self.WRITE_BATCH_SIZE:
+                await self._flush_writes(worksheet)
+
+        await self._flush_writes(worksheet)
+
     async def run(self, max_position: int = 1000) -> None:
-        """Run position tracking for all tasks in single spreadsheet (single tab)."""
+        """Run position tracking for all tasks in single spreadsheet, one tab per worker."""
         spreadsheet_name = self.sheets.spreadsheet.title
         self._short_id = self.sheets.spreadsheet_id[:8]
+        self._not_found = f"{max_position}+"
 
-        worksheet = self.sheets.get_worksheet(self.WORKSHEET_NAME)
-        all_tasks = self.get_tasks_from_sheet()
+        # gspread is blocking; other spreadsheets' workers share this event loop
+        worksheet = await asyncio.to_thread(self.sheets.get_worksheet, self.WORKSHEET_NAME)
+        data = await asyncio.to_thread(self._snapshot, worksheet)
+        all_tasks = self.get_tasks_from_sheet(data)
 
         if not all_tasks:
             logger.warning(f"[{self._short_id}] No tasks in '{spreadsheet_name}'")
             return
 
         # Get column and tasks to process (may resume incomplete)
-        col_idx, tasks = self.get_column_for_tracking(all_tasks, worksheet)
+        col_idx, tasks = await asyncio.to_thread(
+            self.get_column_for_tracking, all_tasks, worksheet, data
+        )
 
         if len(tasks) < len(all_tasks):
             logger.info(
@@ -270,32 +590,52 @@ class PositionTracker:
         else:
             logger.info(f"[{self._short_id}] {spreadsheet_name}: {len(tasks)} queries")
 
-        page = await self._get_fresh_page(0)
+        # Rows repeating an (article, query) pair are searched once
+        unique: list[SearchTask] = []
+        self._duplicates = {}
+        for task in tasks:
+            key = (task.article, task.query)
+            if key in self._duplicates:
+                self._duplicates[key].append(task)
+            else:
+                self._duplicates[key] = []
+                unique.append(task)
+        if len(unique) < len(tasks):
+            logger.info(f"[{self._short_id}] Deduped {len(tasks)} -> {len(unique)} unique searches")
+
+        # Tasks sharing a query go to the same worker so the SERP cache answers
+        # all but the first of them
+        groups: dict[str, list[tuple[int, SearchTask]]] = {}
+        for task_num, task in enumerate(unique, 1):
+            groups.setdefault(task.query, []).append((task_num, task))
+        self._query_articles = {
+            query: frozenset(task.article for _, task in group) for query, group in groups.items()
+        }
+        pending_groups = iter(list(groups.values()))
+
+        num_workers = min(
+            len(groups), settings.tracker_workers, getattr(self.parser, "MAX_WORKERS", settings.tracker_workers)
+        )
+        pages: list[Page] = []
+        try:
+            for worker_id in range(num_workers):
+                pages.append(await self._acquire_page(worker_id))
+        except BaseException:
+            # The browser may have been relaunched under the tabs already taken
+            for page in pages:
+                await self._safe_close_page(page)
+            raise
         results: list = []
+        results_queue: asyncio.Queue[tuple[SearchTask, str, bool] | None] = asyncio.Queue()
+        writer = asyncio.create_task(self._writer(worksheet, col_idx, results_queue, results))
 
         try:
-            for task_num, task in enumerate(tasks, 1):
-                # Short random delay between tasks
-                if task_num > 1:
-                    await asyncio.sleep(random.uniform(0.5, 1.5))
-
-                is_found = False
-                try:
-                    task, result, page, is_found = await self._process_single_task(
-                        task, task_num, len(tasks), max_position, page, worker_id=0
-                    )
-                except Exception as e:
-                    logger.error(f"[{self._short_id}] Fatal error: {e}")
-                    result = "—"
-                    try:
-                        page = await self._get_fresh_page(0)
-                    except Exception:
-                        logger.error(f"[{self._short_id}] Cannot recover, stopping")
-                        break
-
-                results.append((task, result))
-                await self._write_cell_async(worksheet, task.row_index, col_idx, result, is_found)
+            await asyncio.gather(*(
+                self._worker(worker_id, page, pending_groups, results_queue, len(unique), max_position)
+                for worker_id, page in enumerate(pages)
+            ))
         finally:
-            await self._safe_close_page(page)
+            results_queue.put_nowait(None)
+            await writer
 
         logger.info(f"[{self._short_id}] Done: {len(results)}/{len(tasks)}")
@@ -0,0 +1,99 @@
+import gzip
+import hashlib
+import json
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+
+from app.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class SerpEntry:
+    ids: list[str] = field(default_factory=list)  # Product IDs in SERP order
+    complete: bool = False  # True only if the scan covered max_position
+
+    def position_of(self, article: str, max_position: int) -> int | None:
+        """1-based position of article, or None if it is not in the cached part."""
+        try:
+            position = self.ids.index(article) + 1
+        except ValueError:
+            return None
+        return position if position <= max_position else None
+
+
+class SerpCache:
+    """
+    Search results cache keyed by (query, max_position, hour).
+
+    Several articles often share one query, so the SERP collected for the
+    first one answers the rest without another scroll. Complete entries are
+    persisted as gzipped JSON so a restarted run within the same hour reuses
+    them; partial ones (early stop, stalled scroll) stay in memory only.
+    """
+
+    def __init__(self, cache_dir: Path | str = ".cache/serp") -> None:
+        self._dir = Path(cache_dir)
+        self._entries: dict[tuple[str, int, str], SerpEntry] = {}
+        self._evicted_hour = ""
+
+    @staticmethod
+    def _hour() -> str:
+        return datetime.now().strftime("%Y%m%d%H")
+
+    def _path(self, query: str, max_position: int, hour: str) -> Path:
+        digest = hashlib.sha1(f"{max_position}:{query}".encode("utf-8")).hexdigest()
+        return self._dir / f"{digest}-{hour}.json.gz"
+
+    def _evict_stale(self, hour: str) -> None:
+        """Remove entries from previous hours, once per hour."""
+        if hour == self._evicted_hour:
+            return
+        self._evicted_hour = hour
+        self._entries = {key: entry for key, entry in self._entries.items() if key[2] == hour}
+        if not self._dir.exists():
+            return
+        for path in self._dir.glob("*.json.gz"):
+            if not path.name.endswith(f"-{hour}.json.gz"):
+                path.unlink(missing_ok=True)
+
+    def get(self, query: str, max_position: int) -> SerpEntry | None:
+        hour = self._hour()
+        self._evict_stale(hour)
+        key = (query, max_position, hour)
+        entry = self._entries.get(key)
+        if entry is not None:
+            return entry
+
+        path = self._path(query, max_position, hour)
+        if not path.exists():
+            return None
+        try:
+            data = json.loads(gzip.decompress(path.read_bytes()))
+            entry = SerpEntry(ids=data["ids"], complete=data["complete"])
+        except Exception as e:
+            logger.debug(f"Ignoring unreadable SERP cache {path.name}: {e}")
+            return None
+        self._entries[key] = entry
+        return entry
+
+    def put(self, query: str, max_position: int, entry: SerpEntry) -> None:
+        """Store entry unless a longer (or complete) one is already cached."""
+        hour = self._hour()
+        self._evict_stale(hour)
+        key = (query, max_position, hour)
+        current = self._entries.get(key)
+        if current is not None and (current.complete or len(current.ids) >= len(entry.ids)):
+            return
+        self._entries[key] = entry
+
+        if not entry.complete:
+            return
+        try:
+            self._dir.mkdir(parents=True, exist_ok=True)
+            payload = json.dumps({"ids": entry.ids, "complete": entry.complete})
+            self._path(query, max_position, hour).write_bytes(gzip.compress(payload.encode("utf-8")))
+        except Exception as e:
+            logger.debug(f"Failed to persist SERP cache: {e}")
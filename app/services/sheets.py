@@ -19,6 +19,7 @@ class GoogleSheetsService:
         self._client: gspread.Client | None = None
         self._spreadsheet: gspread.Spreadsheet | None = None
         self._spreadsheet_id = spreadsheet_id
+        self._worksheets: dict[str, gspread.Worksheet] = {}
 
     def connect(self) -> None:
         credentials_path = Path(settings.google_credentials_path)
@@ -55,7 +56,10 @@ class GoogleSheetsService:
         return self._spreadsheet_id
 
     def get_worksheet(self, name: str) -> gspread.Worksheet:
-        return self.spreadsheet.worksheet(name)
+        # spreadsheet.worksheet() fetches sheet metadata on every call
+        if name not in self._worksheets:
+            self._worksheets[name] = self.spreadsheet.worksheet(name)
+        return self._worksheets[name]
 
     def list_spreadsheets(self) -> list[str]:
         spreadsheets = self.client.openall()
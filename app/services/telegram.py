@@ -1,4 +1,5 @@
 import asyncio
+import time
 from pathlib import Path
 
 import httpx
@@ -12,10 +13,31 @@ logger = get_logger(__name__)
 class TelegramNotifier:
     """Send notifications to all users who started the bot."""
 
+    ERROR_COOLDOWN = 300.0  # Seconds before the same error is reported again
+
     def __init__(self) -> None:
         self.bot_token = settings.bot_token
         self._base_url = f"https://api.telegram.org/bot{self.bot_token}"
         self._chat_ids: set[int] = set()
+        self._notified: dict[tuple[str, str], float] = {}
+        # Spreadsheets failing together shouldn't burst past Telegram's rate limit
+        self._send_sem = asyncio.Semaphore(2)
+        self._client: httpx.AsyncClient | None = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Shared client - keeps the TLS connection to api.telegram.org alive."""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=self._base_url,
+                timeout=30,
+                limits=httpx.Limits(max_keepalive_connections=4),
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
 
     @property
     def enabled(self) -> bool:
@@ -27,17 +49,16 @@ class TelegramNotifier:
             return set()
 
         try:
-            async with httpx.AsyncClient(timeout=10) as client:
-                response = await client.get(f"{self._base_url}/getUpdates")
-                data = response.json()
+            response = await self._get_client().get("/getUpdates", timeout=10)
+            data = response.json()
 
-                if data.get("ok") and data.get("result"):
-                    for update in data["result"]:
-                        if "message" in update:
-                            chat_id = update["message"]["chat"]["id"]
-                            self._chat_ids.add(chat_id)
+            if data.get("ok") and data.get("result"):
+                for update in data["result"]:
+                    if "message" in update:
+                        chat_id = update["message"]["chat"]["id"]
+                        self._chat_ids.add(chat_id)
 
-                # Silently ignore if no users - don't spam logs
+            # Silently ignore if no users - don't spam logs
         except Exception as e:
             logger.debug(f"Telegram fetch failed: {e}")
 
@@ -48,16 +69,15 @@ class TelegramNotifier:
     ) -> bool:
         """Send message to a specific chat."""
         try:
-            async with httpx.AsyncClient(timeout=30) as client:
-                response = await client.post(
-                    f"{self._base_url}/sendMessage",
-                    json={
-                        "chat_id": chat_id,
-                        "text": text,
-                        "parse_mode": parse_mode,
-                    },
-                )
-                return response.status_code == 200
+            response = await self._get_client().post(
+                "/sendMessage",
+                json={
+                    "chat_id": chat_id,
+                    "text": text,
+                    "parse_mode": parse_mode,
+                },
+            )
+            return response.status_code == 200
         except Exception as e:
             logger.error(f"Failed to send to {chat_id}: {e}")
             return False
@@ -67,17 +87,17 @@ class TelegramNotifier:
     ) -> bool:
         """Send photo to a specific chat."""
         try:
-            async with httpx.AsyncClient(timeout=60) as client:
-                response = await client.post(
-                    f"{self._base_url}/sendPhoto",
-                    data={
-                        "chat_id": chat_id,
-                        "caption": caption or "",
-                        "parse_mode": "HTML",
-                    },
-                    files={"photo": ("screenshot.png", photo, "image/png")},
-                )
-                return response.status_code == 200
+            response = await self._get_client().post(
+                "/sendPhoto",
+                data={
+                    "chat_id": chat_id,
+                    "caption": caption or "",
+                    "parse_mode": "HTML",
+                },
+                files={"photo": ("screenshot.png", photo, "image/png")},
+                timeout=60,
+            )
+            return response.status_code == 200
         except Exception as e:
             logger.error(f"Failed to send photo to {chat_id}: {e}")
             return False
@@ -87,15 +107,31 @@ class TelegramNotifier:
         if not self.enabled:
             return False
 
-        chat_ids = await self._fetch_chat_ids()
-        if not chat_ids:
-            return False
+        async with self._send_sem:
+            chat_ids = await self._fetch_chat_ids()
+            if not chat_ids:
+                return False
 
-        results = await asyncio.gather(
-            *[self._send_to_chat(cid, text, parse_mode) for cid in chat_ids]
-        )
+            results = await asyncio.gather(
+                *[self._send_to_chat(cid, text, parse_mode) for cid in chat_ids]
+            )
         return any(results)
 
+    async def send_error(self, key: tuple[str, str], text: str) -> bool:
+        """
+        Send an error message once per key within ERROR_COOLDOWN.
+
+        Tabs share one browser, so a block or outage fails every spreadsheet
+        at once - report it a single time instead of once per tab.
+        """
+        now = time.monotonic()
+        last = self._notified.get(key)
+        if last is not None and now - last < self.ERROR_COOLDOWN:
+            logger.debug(f"Suppressed duplicate notification: {key}")
+            return False
+        self._notified[key] = now
+        return await self.send_message(text)
+
     async def send_photo(
         self, photo: bytes | Path, caption: str | None = None
     ) -> bool:
@@ -103,16 +139,17 @@ class TelegramNotifier:
         if not self.enabled:
             return False
 
-        chat_ids = await self._fetch_chat_ids()
-        if not chat_ids:
-            return False
-
         if isinstance(photo, Path):
             photo = photo.read_bytes()
 
-        results = await asyncio.gather(
-            *[self._send_photo_to_chat(cid, photo, caption) for cid in chat_ids]
-        )
+        async with self._send_sem:
+            chat_ids = await self._fetch_chat_ids()
+            if not chat_ids:
+                return False
+
+            results = await asyncio.gather(
+                *[self._send_photo_to_chat(cid, photo, caption) for cid in chat_ids]
+            )
         return any(results)
 
 
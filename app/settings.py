@@ -13,6 +13,13 @@ class Settings(BaseSettings):
     browser_timeout: int = 30000
     base_url: str = "https://www.ozon.ru"
 
+    # Parallel pages per spreadsheet (capped by the parser's MAX_WORKERS)
+    tracker_workers: int = 2
+
+    # Minutes between tracking passes. 0 runs once and exits (cron); otherwise
+    # the process stays up and reuses the same browser for every pass
+    tracker_interval_minutes: int = 0
+
     # Logging level: DEBUG, INFO, WARNING, ERROR
     log_level: str = "INFO"
 